@@ -4,10 +4,13 @@ Handles environment variables, model settings, and application configuration
 """
 
 import os
+from bisect import bisect_right
+from functools import cached_property, lru_cache
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from types import MappingProxyType
+from typing import Dict, Any, Optional, List, Mapping
 from pydantic_settings import BaseSettings
-from pydantic import field_validator
+from pydantic import Field, field_validator
 import logging
 
 logger = logging.getLogger(__name__)
@@ -26,7 +29,7 @@ class Settings(BaseSettings):
     CORS_ALLOW_CREDENTIALS: bool = True
     
     # Model Configuration
-    MODEL_CACHE_DIR: Optional[str] = None
+    MODEL_CACHE_DIR: Optional[str] = Field(default=None, validate_default=True)
     MAX_MODELS_IN_MEMORY: int = 3
     MODEL_DEVICE: str = "auto"  # auto, cpu, cuda
     USE_QUANTIZATION: bool = True
@@ -49,15 +52,16 @@ class Settings(BaseSettings):
     MAX_TTS_LENGTH: int = 5000
     TTS_DEFAULT_LANGUAGE: str = "en"
     TTS_CACHE_ENABLED: bool = True
+    TTS_CACHE_MAX_FILES: int = 500
     
     # Export Settings
     EXPORT_TEMP_DIR: Optional[str] = None
     EXPORT_CLEANUP_INTERVAL: int = 3600  # seconds
+    PDF_COMPRESSION: int = 1  # 0 skips zlib on PDF pages (faster, larger files)
     
     # Security Settings
     ENABLE_RATE_LIMITING: bool = False
     RATE_LIMIT_PER_MINUTE: int = 60
-    SANITIZE_INPUTS: bool = True
     
     # Caching Configuration
     REDIS_URL: Optional[str] = None
@@ -72,11 +76,13 @@ class Settings(BaseSettings):
     # Development Settings
     DEBUG: bool = False
     TESTING: bool = False
+    ENABLE_TEST_ROUTES: bool = False  # Expose /health/test-* model diagnostics
     
     @field_validator('MODEL_CACHE_DIR')
     @classmethod
     def validate_cache_dir(cls, v):
-        if v is None:
+        # An empty value (e.g. MODEL_CACHE_DIR= in .env) means unset, not the working directory
+        if not v:
             return str(Path.home() / ".cache" / "summarizepro")
         return v
     
@@ -94,16 +100,19 @@ class Settings(BaseSettings):
             logger.warning(f"Large file size limit: {v}MB. Consider reducing for better performance.")
         return v
     
-    def get_cors_origins_list(self) -> List[str]:
-        """Parse CORS origins from comma-separated string"""
-        if isinstance(self.CORS_ORIGINS, str):
-            return [origin.strip() for origin in self.CORS_ORIGINS.split(",")]
-        return self.CORS_ORIGINS if isinstance(self.CORS_ORIGINS, list) else []
+    @cached_property
+    def cors_origins_list(self) -> tuple[str, ...]:
+        """CORS origins parsed once from the comma-separated string"""
+        raw = self.CORS_ORIGINS
+        if isinstance(raw, (list, tuple)):
+            return tuple(raw)
+        return tuple(origin.strip() for origin in raw.split(","))
     
     model_config = {
         "env_file": ".env",
         "env_file_encoding": "utf-8",
-        "case_sensitive": True
+        "case_sensitive": True,
+        "ignored_types": (cached_property,)
     }
 
 # Model-specific configurations
@@ -160,6 +169,12 @@ MODEL_CONFIGS = {
     }
 }
 
+# Read-only views so shared configs can't drift at runtime
+MODEL_CONFIGS = MappingProxyType({
+    model_type: MappingProxyType(config) for model_type, config in MODEL_CONFIGS.items()
+})
+_EMPTY_CONFIG = MappingProxyType({})
+
 # File type configurations
 SUPPORTED_FILE_TYPES = {
     "text/plain": [".txt"],
@@ -170,6 +185,12 @@ SUPPORTED_FILE_TYPES = {
     "text/csv": [".csv"]
 }
 
+# Flattened lookups so file checks are two set probes
+_SUPPORTED_CONTENT_TYPES = frozenset(SUPPORTED_FILE_TYPES)
+_SUPPORTED_EXTENSIONS = frozenset(
+    ext for extensions in SUPPORTED_FILE_TYPES.values() for ext in extensions
+)
+
 # URL validation patterns
 ALLOWED_URL_PATTERNS = [
     r"^https?://.*",  # HTTP/HTTPS URLs
@@ -194,42 +215,42 @@ RATE_LIMIT_RULES = {
     "/api/v1/tts/*": "3/minute"
 }
 
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    """Get application settings instance"""
+    """Get the shared application settings instance (built once)"""
     return Settings()
 
-def get_model_config(model_type: str) -> Dict[str, Any]:
-    """Get configuration for specific model type"""
-    return MODEL_CONFIGS.get(model_type, {})
+def get_model_config(model_type: str) -> Mapping[str, Any]:
+    """Get read-only configuration for specific model type"""
+    return MODEL_CONFIGS.get(model_type, _EMPTY_CONFIG)
 
 def is_file_type_supported(content_type: str, filename: str) -> bool:
     """Check if file type is supported"""
-    if content_type in SUPPORTED_FILE_TYPES:
+    if content_type in _SUPPORTED_CONTENT_TYPES:
         return True
     
     # Check by file extension
-    file_ext = Path(filename).suffix.lower()
-    for supported_extensions in SUPPORTED_FILE_TYPES.values():
-        if file_ext in supported_extensions:
-            return True
-    
-    return False
+    return os.path.splitext(filename)[1].lower() in _SUPPORTED_EXTENSIONS
 
 def validate_file_size(file_size: int, max_size_mb: int) -> bool:
     """Validate file size against limits"""
     max_size_bytes = max_size_mb * 1024 * 1024
     return file_size <= max_size_bytes
 
+# (upper bound, chunk size, overlap) sorted by bound; None chunk size means "whole content"
+_CHUNK_TABLE = (
+    (2000, None, 0),
+    (10000, 1500, 150),
+)
+_CHUNK_THRESHOLDS = tuple(row[0] for row in _CHUNK_TABLE)
+
 def get_chunk_settings(content_length: int) -> Dict[str, int]:
     """Get optimal chunk settings based on content length"""
-    settings = get_settings()
-    
-    if content_length < 2000:
-        return {"chunk_size": content_length, "chunk_overlap": 0}
-    elif content_length < 10000:
-        return {"chunk_size": 1500, "chunk_overlap": 150}
-    else:
-        return {"chunk_size": settings.CHUNK_SIZE, "chunk_overlap": settings.CHUNK_OVERLAP}
+    i = bisect_right(_CHUNK_THRESHOLDS, content_length)
+    if i < len(_CHUNK_TABLE):
+        _, chunk_size, chunk_overlap = _CHUNK_TABLE[i]
+        return {"chunk_size": chunk_size or content_length, "chunk_overlap": chunk_overlap}
+    return {"chunk_size": settings.CHUNK_SIZE, "chunk_overlap": settings.CHUNK_OVERLAP}
 
 # Global settings instance
 settings = get_settings()
@@ -3,12 +3,14 @@ Summarize-Pro Backend API
 Simplified version for testing and demonstration
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 import logging
+import logging.handlers
+import queue
 import sys
-import time
 import os
 from pathlib import Path
 from dotenv import load_dotenv
@@ -22,20 +24,31 @@ sys.path.append(str(Path(__file__).parent))
 from app.routes.summarize_new import router as summarize_router
 from app.routes.qa import router as qa_router
 from app.routes.export import router as export_router
-from app.routes.health import router as health_router
+from app.routes.health import router as health_router, HEALTH_PAYLOAD
+from app.middleware.health_interceptor import HealthCheckInterceptor
+from app.config.settings import get_settings
 
 # Logging configuration from environment
 log_level = os.getenv("LOG_LEVEL", "INFO")
 log_file = os.getenv("LOG_FILE", "app.log")
 
+# Request handlers only enqueue records; a background listener does the file/console I/O
+log_formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+file_handler = logging.FileHandler(log_file)
+file_handler.setFormatter(log_formatter)
+stream_handler = logging.StreamHandler()
+stream_handler.setFormatter(log_formatter)
+
+log_queue = queue.Queue(-1)
+log_listener = logging.handlers.QueueListener(
+    log_queue, file_handler, stream_handler, respect_handler_level=True
+)
+
 logging.basicConfig(
     level=getattr(logging, log_level),
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.FileHandler(log_file),
-        logging.StreamHandler()
-    ]
+    handlers=[logging.handlers.QueueHandler(log_queue)]
 )
+log_listener.start()
 
 logger = logging.getLogger(__name__)
 
@@ -45,25 +58,33 @@ app = FastAPI(
     description="AI-powered content summarization service",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse
 )
 
 # CORS configuration from environment
-cors_origins = os.getenv("CORS_ORIGINS", "http://localhost:3000,http://localhost:5173").split(",")
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=cors_origins,
+    allow_origins=get_settings().cors_origins_list,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"]
 )
 
+# Compress larger JSON/text responses (summaries, exports)
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Include routers
 app.include_router(summarize_router, prefix="/api/v1", tags=["Summarization"])
 app.include_router(qa_router, prefix="/api/v1", tags=["Q&A"])
 app.include_router(export_router, prefix="/api/v1", tags=["Export"])
 app.include_router(health_router, prefix="/api/v1", tags=["Health & Monitoring"])
 
+@app.on_event("shutdown")
+async def stop_log_listener():
+    """Flush queued log records on shutdown"""
+    log_listener.stop()
+
 @app.get("/")
 async def root():
     """Root endpoint with API information"""
@@ -74,29 +95,29 @@ async def root():
         "health": "/health"
     }
 
-@app.get("/health")
-async def health_check():
-    """Simple health check endpoint"""
-    try:
-        return {
-            "status": "healthy",
-            "service": "Summarize-Pro API",
-            "version": "1.0.0",
-            "timestamp": time.time()
-        }
-    except Exception as e:
-        logger.error(f"Health check failed: {str(e)}")
-        raise HTTPException(status_code=503, detail="Service unavailable")
-
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     """Global exception handler"""
-    logger.error(f"Unhandled exception: {str(exc)}")
-    return JSONResponse(
+    logger.error(f"Unhandled exception on {request.url.path}: {str(exc)}")
+    return ORJSONResponse(
         status_code=500,
         content={"detail": "Internal server error"}
     )
 
+# Liveness probes are answered before routing and middleware; everything else reaches FastAPI
+app = HealthCheckInterceptor(
+    app,
+    payloads={
+        "/health": {
+            "status": "healthy",
+            "service": "Summarize-Pro API",
+            "version": "1.0.0"
+        },
+        "/api/v1/health": HEALTH_PAYLOAD
+    },
+    allowed_origins=get_settings().cors_origins_list
+)
+
 if __name__ == "__main__":
     import uvicorn
     logger.info("Starting Summarize-Pro API...")
@@ -113,6 +134,8 @@ if __name__ == "__main__":
         port=port,
         reload=reload,
         log_level=log_level,
+        loop="asyncio" if sys.platform == "win32" else "uvloop",  # uvloop has no Windows build
+        http="httptools",
         timeout_keep_alive=300,  # 5 minutes for large documents
         timeout_graceful_shutdown=30
     )
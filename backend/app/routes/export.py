@@ -3,15 +3,24 @@ Export API Routes
 Handles document export and text-to-speech functionality
 """
 
-from fastapi import APIRouter, HTTPException, Response
-from fastapi.responses import FileResponse
-from pydantic import BaseModel
-from typing import Optional, Dict, Any
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, constr
+from typing import Optional, Dict, Any, NamedTuple, Tuple
 import logging
+import asyncio
 import tempfile
 import os
 from pathlib import Path
 import io
+import re
+import gc
+import hashlib
+import threading
+import zipfile
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
 
 # Document generation imports
 from reportlab.lib.pagesizes import letter, A4
@@ -26,427 +35,520 @@ from docx.shared import Inches
 from gtts import gTTS
 import pyttsx3
 
+from app.config.settings import get_settings
+
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Document rendering and TTS are blocking (CPU-bound or network I/O); run them
+# off the event loop so concurrent export requests don't queue behind each other
+_blocking_executor = ThreadPoolExecutor(
+    max_workers=min(32, (os.cpu_count() or 1) * 2),
+    thread_name_prefix="export"
+)
+
+async def _run_blocking(func, *args):
+    """Run a blocking callable in the export thread pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_blocking_executor, func, *args)
+
+# Content-addressed store for synthesized MP3s, keyed by (text, language, slow)
+# Created on first write, so importing the module leaves no directories behind
+TTS_CACHE_DIR = Path(get_settings().MODEL_CACHE_DIR) / "tts"
+
+def _tts_cache_path(text: str, language: str, slow: bool) -> Path:
+    """Cache location for a given TTS input"""
+    key = hashlib.sha256(f"{text}|{language}|{slow}".encode('utf-8')).hexdigest()
+    return TTS_CACHE_DIR / f"{key}.mp3"
+
+def _prune_tts_cache(max_files: int):
+    """Drop least recently used cache entries beyond max_files"""
+    try:
+        entries = sorted(TTS_CACHE_DIR.glob('*.mp3'), key=lambda p: p.stat().st_mtime, reverse=True)
+        for stale in entries[max_files:]:
+            stale.unlink(missing_ok=True)
+    except Exception as e:
+        logger.warning(f"TTS cache pruning failed: {str(e)}")
+
+def _read_tts_cache(cache_path: Path) -> bytes:
+    """Read cached audio in full, so a later prune cannot pull the file out from under the response"""
+    os.utime(cache_path)  # Mark as recently used
+    return cache_path.read_bytes()
+
+def _store_tts_cache(cache_path: Path, audio: bytes):
+    """Publish synthesized audio to the cache atomically"""
+    partial_path = cache_path.with_suffix(f'.{os.getpid()}.{threading.get_ident()}.part')
+    try:
+        TTS_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        partial_path.write_bytes(audio)
+        os.replace(partial_path, cache_path)
+        _prune_tts_cache(get_settings().TTS_CACHE_MAX_FILES)
+    except Exception as e:
+        partial_path.unlink(missing_ok=True)
+        logger.warning(f"TTS cache write failed: {str(e)}")
+
+def _synthesize_gtts(tts: gTTS) -> bytes:
+    """Synthesize gTTS audio straight into memory as MP3 bytes"""
+    buffer = io.BytesIO()
+    tts.write_to_fp(buffer)
+    return buffer.getvalue()
+
+# pyttsx3 driver bootstrap is slow, so keep one warm engine. Its driver is bound to the
+# thread that created it, so the engine is only ever created and driven on this one worker.
+_pyttsx3_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pyttsx3")
+_pyttsx3_engine = None
+_pyttsx3_base_rate = None
+
+async def _run_pyttsx3(func, *args):
+    """Run a callable on the dedicated pyttsx3 thread"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_pyttsx3_executor, func, *args)
+
+def _get_pyttsx3_engine():
+    """Initialize the pyttsx3 engine on first use. Call on the pyttsx3 thread only."""
+    global _pyttsx3_engine, _pyttsx3_base_rate
+    if _pyttsx3_engine is None:
+        _pyttsx3_engine = pyttsx3.init()
+        _pyttsx3_base_rate = _pyttsx3_engine.getProperty('rate')
+    return _pyttsx3_engine
+
+def _synthesize_pyttsx3(text: str, speed: float) -> bytes:
+    """Synthesize speech to WAV bytes with the shared pyttsx3 engine"""
+    # pyttsx3 can only write to a path; the directory is removed on exit
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output_path = os.path.join(temp_dir, 'speech.wav')
+        
+        engine = _get_pyttsx3_engine()
+        
+        # Set properties relative to the engine's default rate
+        engine.setProperty('rate', int(_pyttsx3_base_rate * speed))
+        
+        # Save to file
+        engine.save_to_file(text, output_path)
+        engine.runAndWait()
+        
+        return Path(output_path).read_bytes()
+
+# Common gTTS supported languages
+SUPPORTED_TTS_LANGUAGES = {
+    'en': 'English',
+    'es': 'Spanish',
+    'fr': 'French',
+    'de': 'German',
+    'it': 'Italian',
+    'pt': 'Portuguese',
+    'ru': 'Russian',
+    'ja': 'Japanese',
+    'ko': 'Korean',
+    'zh': 'Chinese (Mandarin)',
+    'ar': 'Arabic',
+    'hi': 'Hindi',
+    'nl': 'Dutch',
+    'sv': 'Swedish',
+    'no': 'Norwegian',
+    'da': 'Danish',
+    'fi': 'Finnish',
+    'pl': 'Polish',
+    'tr': 'Turkish',
+    'th': 'Thai'
+}
+
+# The language list never changes at runtime, so serialize the response once
+_LANGUAGES_RESPONSE_BYTES = orjson.dumps({
+    'supported_languages': SUPPORTED_TTS_LANGUAGES,
+    'default_language': 'en',
+    'total_languages': len(SUPPORTED_TTS_LANGUAGES)
+})
+
+# Size limits are enforced while parsing, before any rendering work starts
+MAX_EXPORT_CONTENT_LENGTH = 1_000_000
+MAX_EXPORT_TITLE_LENGTH = 256
 
 # Pydantic models
 class ExportRequest(BaseModel):
-    content: str
-    title: Optional[str] = "Summary Report"
+    content: constr(strip_whitespace=True, min_length=1, max_length=MAX_EXPORT_CONTENT_LENGTH)
+    title: Optional[constr(max_length=MAX_EXPORT_TITLE_LENGTH)] = "Summary Report"
     format: str  # txt, docx, pdf
     metadata: Optional[Dict[str, Any]] = {}
 
 class TTSRequest(BaseModel):
-    text: str
+    text: constr(strip_whitespace=True, min_length=1, max_length=get_settings().MAX_TTS_LENGTH)
     language: Optional[str] = "en"
     speed: Optional[float] = 1.0
 
+_PARAGRAPH_SPLIT_RE = re.compile(r'\n\n+')
+
+class PreparedContent(NamedTuple):
+    """Export content split and formatted once, shared by all renderers"""
+    paragraphs: Tuple[str, ...]
+    meta_rows: Tuple[Tuple[str, str], ...]
+
+def _prepare_content(request: ExportRequest) -> PreparedContent:
+    """Split content into non-empty paragraphs and format metadata rows"""
+    paragraphs = tuple(p.strip() for p in _PARAGRAPH_SPLIT_RE.split(request.content) if p.strip())
+    # Tuples keep prepared content hashable for future per-request caching
+    meta_rows = tuple(
+        (key.replace('_', ' ').title(), str(value))
+        for key, value in (request.metadata or {}).items()
+    )
+    return PreparedContent(paragraphs, meta_rows)
+
+def _render_txt(request: ExportRequest, prepared: PreparedContent) -> bytes:
+    """Render an export request as a plain-text file"""
+    buffer = io.StringIO()
+    
+    # Write header
+    buffer.write(f"{request.title}\n")
+    buffer.write("=" * len(request.title) + "\n\n")
+    
+    # Write metadata if available
+    if prepared.meta_rows:
+        buffer.write("METADATA:\n")
+        for label, value in prepared.meta_rows:
+            buffer.write(f"{label}: {value}\n")
+        buffer.write("\n")
+    
+    # Write main content
+    buffer.write("CONTENT:\n")
+    buffer.write(request.content)
+    
+    return buffer.getvalue().encode('utf-8')
+
+def _load_docx_template() -> bytes:
+    """Serialize python-docx's default template once for reuse by every render"""
+    buffer = io.BytesIO()
+    Document().save(buffer)
+    return buffer.getvalue()
+
+_DOCX_TEMPLATE_BYTES = _load_docx_template()
+
+def _fill_docx(doc, request: ExportRequest, prepared: PreparedContent):
+    """Add title, metadata table and content paragraphs to a DOCX document"""
+    # Add title
+    title = doc.add_heading(request.title, 0)
+    title.alignment = 1  # Center alignment
+    
+    # Add metadata table if available
+    if prepared.meta_rows:
+        doc.add_heading('Summary Information', level=1)
+        
+        # Create metadata table with every row up front; add_row() rescans the table each call
+        table = doc.add_table(rows=len(prepared.meta_rows) + 1, cols=2)
+        table.style = 'Table Grid'
+        rows = table.rows
+        
+        # Header row
+        hdr_cells = rows[0].cells
+        hdr_cells[0].text = 'Property'
+        hdr_cells[1].text = 'Value'
+        
+        # Add metadata rows
+        for row, (label, value) in zip(rows[1:], prepared.meta_rows):
+            row_cells = row.cells
+            row_cells[0].text = label
+            row_cells[1].text = value
+        
+        doc.add_page_break()
+    
+    # Add main content
+    doc.add_heading('Summary', level=1)
+    
+    for paragraph in prepared.paragraphs:
+        doc.add_paragraph(paragraph)
+
+def _render_docx(request: ExportRequest, prepared: PreparedContent) -> bytes:
+    """Render an export request as a DOCX document"""
+    # Create DOCX document from the preloaded base template
+    doc = Document(io.BytesIO(_DOCX_TEMPLATE_BYTES))
+    
+    try:
+        _fill_docx(doc, request, prepared)
+        
+        # Save document to memory
+        buffer = io.BytesIO()
+        doc.save(buffer)
+        return buffer.getvalue()
+    finally:
+        # python-docx's lxml trees are only reclaimed by a collection; run it on failures too
+        del doc
+        gc.collect()
+
+# PDF styles and spacers are never mutated after construction, so build them once
+_PDF_STYLES = getSampleStyleSheet()
+
+_PDF_TITLE_STYLE = ParagraphStyle(
+    'CustomTitle',
+    parent=_PDF_STYLES['Heading1'],
+    fontSize=24,
+    spaceAfter=30,
+    alignment=1  # Center
+)
+
+_PDF_HEADING_STYLE = ParagraphStyle(
+    'CustomHeading',
+    parent=_PDF_STYLES['Heading2'],
+    fontSize=16,
+    spaceAfter=12,
+    textColor=colors.darkblue
+)
+
+# Body paragraphs carry their own trailing gap so no Spacer flowable is needed between them
+_PDF_BODY_STYLE = ParagraphStyle(
+    'CustomBody',
+    parent=_PDF_STYLES['Normal'],
+    spaceAfter=12
+)
+
+_PDF_META_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 12),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black)
+])
+
+_PARA_SPACER = Spacer(1, 12)
+
+def _render_pdf(request: ExportRequest, prepared: PreparedContent) -> bytes:
+    """Render an export request as a PDF document"""
+    # Create PDF document in memory
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(
+        buffer,
+        pagesize=A4,
+        rightMargin=72,
+        leftMargin=72,
+        topMargin=72,
+        bottomMargin=18,
+        pageCompression=get_settings().PDF_COMPRESSION
+    )
+    
+    # Build document content
+    story = []
+    
+    # Add title
+    story.append(Paragraph(request.title, _PDF_TITLE_STYLE))
+    story.append(_PARA_SPACER)
+    
+    # Add metadata table if available
+    if prepared.meta_rows:
+        story.append(Paragraph("Summary Information", _PDF_HEADING_STYLE))
+        
+        # Create metadata table
+        table_data = [['Property', 'Value']]
+        table_data.extend([label, value] for label, value in prepared.meta_rows)
+        
+        table = Table(table_data, colWidths=[2.5*inch, 3.5*inch])
+        table.setStyle(_PDF_META_TABLE_STYLE)
+        
+        story.append(table)
+        story.append(Spacer(1, 20))
+    
+    # Add main content
+    story.append(Paragraph("Summary", _PDF_HEADING_STYLE))
+    
+    story.extend(Paragraph(paragraph, _PDF_BODY_STYLE) for paragraph in prepared.paragraphs)
+    
+    # Build PDF
+    doc.build(story)
+    
+    return buffer.getvalue()
+
+def _build_zip(files: Dict[str, bytes]) -> bytes:
+    """Pack rendered exports into a single ZIP archive"""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for filename, data in files.items():
+            archive.writestr(filename, data)
+    return buffer.getvalue()
+
+async def validated_export(request: ExportRequest) -> ExportRequest:
+    """Normalize an export request shared by the single-format export routes"""
+    if not request.title:
+        request.title = "Summary Report"
+    return request
+
+def _attachment_header(filename: str) -> str:
+    """Content-Disposition for a download, RFC 5987-encoded like Starlette's FileResponse"""
+    # quote() escapes quotes, control characters and non-ASCII, so the plain form only carries safe names
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{filename}"'
+
+async def _export_response(request: ExportRequest, renderer, extension: str, media_type: str) -> Response:
+    """Render an export request off the event loop and wrap it as a download"""
+    data = await _run_blocking(renderer, request, _prepare_content(request))
+    
+    # Return file
+    filename = f"{request.title.replace(' ', '_')}.{extension}"
+    return Response(
+        content=data,
+        media_type=media_type,
+        headers={'Content-Disposition': _attachment_header(filename)}
+    )
+
+# Unexpected failures propagate to the app-level exception handler in main.py
 @router.post("/export/txt")
-async def export_txt(request: ExportRequest):
+async def export_txt(request: ExportRequest = Depends(validated_export)):
     """Export content as TXT file"""
-    try:
-        logger.info("Exporting content as TXT")
-        
-        if not request.content.strip():
-            raise HTTPException(status_code=400, detail="Content cannot be empty")
-        
-        # Create temporary file
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False, encoding='utf-8') as temp_file:
-            # Write header
-            temp_file.write(f"{request.title}\n")
-            temp_file.write("=" * len(request.title) + "\n\n")
-            
-            # Write metadata if available
-            if request.metadata:
-                temp_file.write("METADATA:\n")
-                for key, value in request.metadata.items():
-                    temp_file.write(f"{key.replace('_', ' ').title()}: {value}\n")
-                temp_file.write("\n")
-            
-            # Write main content
-            temp_file.write("CONTENT:\n")
-            temp_file.write(request.content)
-            
-            temp_file_path = temp_file.name
-        
-        # Return file
-        filename = f"{request.title.replace(' ', '_')}.txt"
-        return FileResponse(
-            path=temp_file_path,
-            filename=filename,
-            media_type='text/plain',
-            background=lambda: os.unlink(temp_file_path)  # Clean up after sending
-        )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error exporting TXT: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"TXT export failed: {str(e)}")
+    logger.info("Exporting content as TXT")
+    return await _export_response(request, _render_txt, 'txt', 'text/plain; charset=utf-8')
 
 @router.post("/export/docx")
-async def export_docx(request: ExportRequest):
+async def export_docx(request: ExportRequest = Depends(validated_export)):
     """Export content as DOCX file"""
-    try:
-        logger.info("Exporting content as DOCX")
-        
-        if not request.content.strip():
-            raise HTTPException(status_code=400, detail="Content cannot be empty")
-        
-        # Create temporary file
-        with tempfile.NamedTemporaryFile(suffix='.docx', delete=False) as temp_file:
-            temp_file_path = temp_file.name
-        
-        # Create DOCX document
-        doc = Document()
-        
-        # Add title
-        title = doc.add_heading(request.title, 0)
-        title.alignment = 1  # Center alignment
-        
-        # Add metadata table if available
-        if request.metadata:
-            doc.add_heading('Summary Information', level=1)
-            
-            # Create metadata table
-            table = doc.add_table(rows=1, cols=2)
-            table.style = 'Table Grid'
-            
-            # Header row
-            hdr_cells = table.rows[0].cells
-            hdr_cells[0].text = 'Property'
-            hdr_cells[1].text = 'Value'
-            
-            # Add metadata rows
-            for key, value in request.metadata.items():
-                row_cells = table.add_row().cells
-                row_cells[0].text = key.replace('_', ' ').title()
-                row_cells[1].text = str(value)
-            
-            doc.add_page_break()
-        
-        # Add main content
-        doc.add_heading('Summary', level=1)
-        
-        # Split content into paragraphs
-        paragraphs = request.content.split('\n\n')
-        for paragraph in paragraphs:
-            if paragraph.strip():
-                doc.add_paragraph(paragraph.strip())
-        
-        # Save document
-        doc.save(temp_file_path)
-        
-        # Return file
-        filename = f"{request.title.replace(' ', '_')}.docx"
-        return FileResponse(
-            path=temp_file_path,
-            filename=filename,
-            media_type='application/vnd.openxmlformats-officedocument.wordprocessingml.document',
-            background=lambda: os.unlink(temp_file_path)
-        )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error exporting DOCX: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"DOCX export failed: {str(e)}")
+    logger.info("Exporting content as DOCX")
+    return await _export_response(
+        request, _render_docx, 'docx',
+        'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+    )
 
 @router.post("/export/pdf")
-async def export_pdf(request: ExportRequest):
+async def export_pdf(request: ExportRequest = Depends(validated_export)):
     """Export content as PDF file"""
-    try:
-        logger.info("Exporting content as PDF")
-        
-        if not request.content.strip():
-            raise HTTPException(status_code=400, detail="Content cannot be empty")
-        
-        # Create temporary file
-        with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as temp_file:
-            temp_file_path = temp_file.name
-        
-        # Create PDF document
-        doc = SimpleDocTemplate(
-            temp_file_path,
-            pagesize=A4,
-            rightMargin=72,
-            leftMargin=72,
-            topMargin=72,
-            bottomMargin=18
-        )
-        
-        # Get styles
-        styles = getSampleStyleSheet()
-        
-        # Create custom styles
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=24,
-            spaceAfter=30,
-            alignment=1  # Center
-        )
-        
-        heading_style = ParagraphStyle(
-            'CustomHeading',
-            parent=styles['Heading2'],
-            fontSize=16,
-            spaceAfter=12,
-            textColor=colors.darkblue
-        )
-        
-        # Build document content
-        story = []
-        
-        # Add title
-        story.append(Paragraph(request.title, title_style))
-        story.append(Spacer(1, 12))
-        
-        # Add metadata table if available
-        if request.metadata:
-            story.append(Paragraph("Summary Information", heading_style))
-            
-            # Create metadata table
-            table_data = [['Property', 'Value']]
-            for key, value in request.metadata.items():
-                table_data.append([
-                    key.replace('_', ' ').title(),
-                    str(value)
-                ])
-            
-            table = Table(table_data, colWidths=[2.5*inch, 3.5*inch])
-            table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 12),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black)
-            ]))
-            
-            story.append(table)
-            story.append(Spacer(1, 20))
-        
-        # Add main content
-        story.append(Paragraph("Summary", heading_style))
-        
-        # Split content into paragraphs
-        paragraphs = request.content.split('\n\n')
-        for paragraph in paragraphs:
-            if paragraph.strip():
-                story.append(Paragraph(paragraph.strip(), styles['Normal']))
-                story.append(Spacer(1, 12))
-        
-        # Build PDF
-        doc.build(story)
-        
-        # Return file
-        filename = f"{request.title.replace(' ', '_')}.pdf"
-        return FileResponse(
-            path=temp_file_path,
-            filename=filename,
-            media_type='application/pdf',
-            background=lambda: os.unlink(temp_file_path)
-        )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error exporting PDF: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"PDF export failed: {str(e)}")
+    logger.info("Exporting content as PDF")
+    return await _export_response(request, _render_pdf, 'pdf', 'application/pdf')
 
 @router.post("/tts/generate")
 async def generate_tts(request: TTSRequest):
     """Generate text-to-speech audio file"""
+    logger.info("Generating TTS audio")
+    
+    settings = get_settings()
+    slow = request.speed < 1.0
+    cache_path = _tts_cache_path(request.text, request.language, slow) if settings.TTS_CACHE_ENABLED else None
+    
+    # Repeat requests skip the gTTS round-trip entirely
+    if cache_path is not None:
+        try:
+            audio = await _run_blocking(_read_tts_cache, cache_path)
+        except FileNotFoundError:
+            # Not cached, or pruned by a concurrent request since; synthesize below
+            audio = None
+        if audio:
+            logger.info("Serving TTS audio from cache")
+            return Response(
+                content=audio,
+                media_type='audio/mpeg',
+                headers={'Content-Disposition': 'attachment; filename="summary_audio.mp3"'}
+            )
+    
     try:
-        logger.info("Generating TTS audio")
+        # Use gTTS for text-to-speech
+        tts = gTTS(
+            text=request.text,
+            lang=request.language,
+            slow=slow
+        )
+        
+        # gTTS does blocking HTTPS I/O
+        audio = await _run_blocking(_synthesize_gtts, tts)
         
-        if not request.text.strip():
-            raise HTTPException(status_code=400, detail="Text cannot be empty")
+        # Verify audio was produced
+        if not audio:
+            raise Exception("TTS file generation failed")
         
-        if len(request.text) > 5000:
-            raise HTTPException(status_code=400, detail="Text too long for TTS (max 5000 characters)")
+        if cache_path is not None:
+            await _run_blocking(_store_tts_cache, cache_path, audio)
+        
+        # Return audio file
+        return Response(
+            content=audio,
+            media_type='audio/mpeg',
+            headers={'Content-Disposition': 'attachment; filename="summary_audio.mp3"'}
+        )
         
-        # Create temporary file
-        with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as temp_file:
-            temp_file_path = temp_file.name
+    except Exception as gtts_error:
+        logger.warning(f"gTTS failed: {str(gtts_error)}, trying pyttsx3")
         
+        # Fallback to pyttsx3
         try:
-            # Use gTTS for text-to-speech
-            tts = gTTS(
-                text=request.text,
-                lang=request.language,
-                slow=False if request.speed >= 1.0 else True
-            )
-            
-            # Save synchronously to avoid async issues
-            tts.save(temp_file_path)
-            
-            # Verify file was created
-            if not os.path.exists(temp_file_path) or os.path.getsize(temp_file_path) == 0:
-                raise Exception("TTS file generation failed")
-            
-            # Define cleanup function
-            def cleanup_file():
-                try:
-                    if os.path.exists(temp_file_path):
-                        os.unlink(temp_file_path)
-                except Exception:
-                    pass  # Ignore cleanup errors
+            audio = await _run_pyttsx3(_synthesize_pyttsx3, request.text, request.speed)
             
-            # Return audio file
-            return FileResponse(
-                path=temp_file_path,
-                filename="summary_audio.mp3",
-                media_type='audio/mpeg',
-                background=cleanup_file
+            return Response(
+                content=audio,
+                media_type='audio/wav',
+                headers={'Content-Disposition': 'attachment; filename="summary_audio.wav"'}
             )
             
-        except Exception as gtts_error:
-            logger.warning(f"gTTS failed: {str(gtts_error)}, trying pyttsx3")
-            
-            # Fallback to pyttsx3
-            try:
-                engine = pyttsx3.init()
-                
-                # Set properties
-                rate = engine.getProperty('rate')
-                engine.setProperty('rate', int(rate * request.speed))
-                
-                # Save to file
-                engine.save_to_file(request.text, temp_file_path.replace('.mp3', '.wav'))
-                engine.runAndWait()
-                
-                wav_path = temp_file_path.replace('.mp3', '.wav')
-                
-                # Define cleanup function for WAV file
-                def cleanup_wav_file():
-                    try:
-                        if os.path.exists(wav_path):
-                            os.unlink(wav_path)
-                    except Exception:
-                        pass  # Ignore cleanup errors
-                
-                return FileResponse(
-                    path=wav_path,
-                    filename="summary_audio.wav",
-                    media_type='audio/wav',
-                    background=cleanup_wav_file
-                )
-                
-            except Exception as pyttsx3_error:
-                logger.error(f"Both TTS engines failed: gTTS: {gtts_error}, pyttsx3: {pyttsx3_error}")
-                raise HTTPException(status_code=500, detail="TTS generation failed with both engines")
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error generating TTS: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"TTS generation failed: {str(e)}")
+        except Exception as pyttsx3_error:
+            logger.error(f"Both TTS engines failed: gTTS: {gtts_error}, pyttsx3: {pyttsx3_error}")
+            raise HTTPException(status_code=500, detail="TTS generation failed with both engines")
 
 @router.get("/tts/languages")
 async def get_supported_languages():
     """Get list of supported TTS languages"""
-    try:
-        # Common gTTS supported languages
-        supported_languages = {
-            'en': 'English',
-            'es': 'Spanish',
-            'fr': 'French',
-            'de': 'German',
-            'it': 'Italian',
-            'pt': 'Portuguese',
-            'ru': 'Russian',
-            'ja': 'Japanese',
-            'ko': 'Korean',
-            'zh': 'Chinese (Mandarin)',
-            'ar': 'Arabic',
-            'hi': 'Hindi',
-            'nl': 'Dutch',
-            'sv': 'Swedish',
-            'no': 'Norwegian',
-            'da': 'Danish',
-            'fi': 'Finnish',
-            'pl': 'Polish',
-            'tr': 'Turkish',
-            'th': 'Thai'
-        }
-        
-        return {
-            'supported_languages': supported_languages,
-            'default_language': 'en',
-            'total_languages': len(supported_languages)
-        }
-        
-    except Exception as e:
-        logger.error(f"Error getting supported languages: {str(e)}")
-        raise HTTPException(status_code=500, detail="Failed to get supported languages")
+    return Response(
+        content=_LANGUAGES_RESPONSE_BYTES,
+        media_type='application/json',
+        headers={'Cache-Control': 'public, max-age=86400'}
+    )
 
 @router.post("/export/batch")
 async def batch_export(
-    content: str,
-    title: str = "Summary Report",
+    content: str = Query(..., min_length=1, max_length=MAX_EXPORT_CONTENT_LENGTH),
+    title: str = Query("Summary Report", max_length=MAX_EXPORT_TITLE_LENGTH),
     formats: list = ["txt", "docx", "pdf"],
     metadata: dict = {}
 ):
-    """Export content in multiple formats"""
-    try:
-        logger.info(f"Batch exporting content in formats: {formats}")
-        
-        if not content.strip():
-            raise HTTPException(status_code=400, detail="Content cannot be empty")
-        
-        valid_formats = {"txt", "docx", "pdf"}
-        invalid_formats = set(formats) - valid_formats
-        
-        if invalid_formats:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Invalid formats: {invalid_formats}. Supported: {valid_formats}"
-            )
-        
-        results = {}
-        
-        for format_type in formats:
-            try:
-                request = ExportRequest(
-                    content=content,
-                    title=title,
-                    format=format_type,
-                    metadata=metadata
-                )
-                
-                if format_type == "txt":
-                    result = await export_txt(request)
-                elif format_type == "docx":
-                    result = await export_docx(request)
-                elif format_type == "pdf":
-                    result = await export_pdf(request)
-                
-                results[format_type] = {
-                    'status': 'success',
-                    'filename': result.filename if hasattr(result, 'filename') else f"{title}.{format_type}"
-                }
-                
-            except Exception as e:
-                logger.error(f"Failed to export {format_type}: {str(e)}")
-                results[format_type] = {
-                    'status': 'error',
-                    'error': str(e)
-                }
-        
-        return {
-            'results': results,
-            'total_formats': len(formats),
-            'successful_exports': len([r for r in results.values() if r['status'] == 'success']),
-            'failed_exports': len([r for r in results.values() if r['status'] == 'error'])
-        }
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error in batch export: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Batch export failed: {str(e)}")
+    """Export content in multiple formats, returned together as a ZIP archive"""
+    logger.info(f"Batch exporting content in formats: {formats}")
+    
+    if not content.strip():
+        raise HTTPException(status_code=400, detail="Content cannot be empty")
+    
+    valid_formats = {"txt", "docx", "pdf"}
+    invalid_formats = set(formats) - valid_formats
+    
+    if invalid_formats:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid formats: {invalid_formats}. Supported: {valid_formats}"
+        )
+    
+    renderers = {"txt": _render_txt, "docx": _render_docx, "pdf": _render_pdf}
+    requested_formats = list(dict.fromkeys(formats))
+    
+    # Split/format the content once for every renderer
+    request = ExportRequest(content=content, title=title, format="batch", metadata=metadata)
+    prepared = _prepare_content(request)
+    
+    # Formats are independent, so render each once, concurrently
+    outcomes = await asyncio.gather(
+        *(
+            _run_blocking(renderers[format_type], request, prepared)
+            for format_type in requested_formats
+        ),
+        return_exceptions=True
+    )
+    
+    base_name = title.replace(' ', '_')
+    files = {}
+    failed_formats = []
+    
+    for format_type, outcome in zip(requested_formats, outcomes):
+        if isinstance(outcome, Exception):
+            logger.error(f"Failed to export {format_type}: {str(outcome)}")
+            failed_formats.append(format_type)
+        else:
+            files[f"{base_name}.{format_type}"] = outcome
+    
+    if not files:
+        raise HTTPException(status_code=500, detail=f"All exports failed: {failed_formats}")
+    
+    archive = await _run_blocking(_build_zip, files)
+    
+    headers = {'Content-Disposition': _attachment_header(f"{base_name}.zip")}
+    if failed_formats:
+        headers['X-Failed-Formats'] = ','.join(failed_formats)
+    
+    return Response(
+        content=archive,
+        media_type='application/zip',
+        headers=headers
+    )
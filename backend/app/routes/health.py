@@ -3,98 +3,206 @@ Health Check and System Monitoring Endpoints
 Provides detailed system status, model information, and performance metrics
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from typing import Dict, Any
+from functools import lru_cache, partial
+from types import MappingProxyType
 import logging
+import orjson
+import importlib.metadata
+import asyncio
 import torch
 import psutil
 import time
+import threading
 import os
+import re
+import sys
 from pathlib import Path
 
 from app.services.models import model_manager
+from app.config.settings import get_settings
 
 logger = logging.getLogger(__name__)
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
-@router.get("/health")
-async def health_check():
-    """Basic health check endpoint"""
-    try:
-        return {
-            "status": "healthy",
-            "service": "SummarizePro API",
-            "version": "2.0.0",
-            "timestamp": time.time()
+# /health/test-* endpoints run full model inference; only mounted when ENABLE_TEST_ROUTES is set
+test_router = APIRouter(default_response_class=ORJSONResponse)
+
+# GET /health is served by HealthCheckInterceptor (app/middleware) ahead of routing
+HEALTH_PAYLOAD = {
+    "status": "healthy",
+    "service": "SummarizePro API",
+    "version": "2.0.0"
+}
+
+# Module-local bindings for psutil calls made on every probe
+_virtual_memory = psutil.virtual_memory
+_disk_usage = psutil.disk_usage
+_cpu_percent = psutil.cpu_percent
+
+# Readiness only needs used-memory percent; on Linux read the two fields directly instead of psutil's full snapshot
+_READ_PROC_MEMINFO = sys.platform.startswith("linux")
+_MEMINFO_TOTAL = re.compile(rb"MemTotal:\s+(\d+)")
+_MEMINFO_AVAILABLE = re.compile(rb"MemAvailable:\s+(\d+)")
+
+def _memory_percent_used() -> float:
+    """Percentage of RAM in use, matching psutil.virtual_memory().percent"""
+    if _READ_PROC_MEMINFO:
+        try:
+            with open("/proc/meminfo", "rb") as f:
+                data = f.read(512)
+            total = int(_MEMINFO_TOTAL.search(data).group(1))
+            available = int(_MEMINFO_AVAILABLE.search(data).group(1))
+            return (total - available) / total * 100
+        except (OSError, AttributeError, ValueError):
+            # Unreadable file or a kernel without MemAvailable
+            pass
+    return _virtual_memory().percent
+
+# CUDA availability is fixed for the process; checked once instead of per request
+CUDA_AVAILABLE = torch.cuda.is_available()
+
+# Interpreter and torch versions can't change while the process runs
+ENVIRONMENT_INFO = {
+    "python_version": f"{sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}",
+    "torch_version": torch.__version__,
+    "cuda_version": torch.version.cuda if CUDA_AVAILABLE else None
+}
+
+# Device properties are fixed for the process; allocator counters are sampled at most every GPU_MEMORY_TTL seconds
+GPU_TOTAL_MEMORY = torch.cuda.get_device_properties(0).total_memory if CUDA_AVAILABLE else 0
+GPU_DEVICE_NAME = torch.cuda.get_device_name(0) if CUDA_AVAILABLE else None
+GPU_DEVICE_COUNT = torch.cuda.device_count() if CUDA_AVAILABLE else 0
+GPU_MEMORY_TTL = 2  # seconds
+_gpu_memory_sample = {"time": float("-inf"), "allocated": 0, "reserved": 0}
+
+def _gpu_memory_cached():
+    """(allocated, reserved) bytes on device 0, refreshed at most every GPU_MEMORY_TTL seconds"""
+    now = time.monotonic()
+    stale = now - _gpu_memory_sample["time"] >= GPU_MEMORY_TTL
+    
+    # While a forward pass runs, keep serving the last sample rather than contend for the allocator lock
+    never_sampled = _gpu_memory_sample["time"] == float("-inf")
+    if stale and (never_sampled or not model_manager.inference_active):
+        _gpu_memory_sample.update(
+            time=now,
+            allocated=torch.cuda.memory_allocated(0),
+            reserved=torch.cuda.memory_reserved(0)
+        )
+    return _gpu_memory_sample["allocated"], _gpu_memory_sample["reserved"]
+
+# Serialized /health/detailed snapshot, refreshed at most every DETAILED_HEALTH_TTL seconds
+DETAILED_HEALTH_TTL = 10
+_detailed_health_cache = {"time": float("-inf"), "payload": None}
+_detailed_health_lock = asyncio.Lock()
+
+# CPU usage is sampled in the background so handlers never wait on psutil's interval sleep
+CPU_SAMPLE_INTERVAL = 2  # seconds
+_last_cpu_percent = 0.0
+_cpu_sampler_task = None
+
+async def _sample_cpu():
+    """Refresh _last_cpu_percent with the usage delta since the previous sample"""
+    global _last_cpu_percent
+    while True:
+        await asyncio.sleep(CPU_SAMPLE_INTERVAL)
+        _last_cpu_percent = _cpu_percent(interval=None)
+
+@router.on_event("startup")
+async def start_cpu_sampler():
+    """Prime psutil's CPU baseline and start the background sampler"""
+    global _cpu_sampler_task
+    psutil.cpu_percent(interval=None)
+    _cpu_sampler_task = asyncio.create_task(_sample_cpu())
+
+@router.on_event("shutdown")
+async def stop_cpu_sampler():
+    """Stop the background CPU sampler"""
+    if _cpu_sampler_task is not None:
+        _cpu_sampler_task.cancel()
+
+def _collect_system_info() -> Dict[str, Any]:
+    """CPU, memory and disk usage"""
+    memory = _virtual_memory()
+    disk = _disk_usage('/')
+    
+    return {
+        "cpu_percent": _last_cpu_percent,
+        "memory": {
+            "total_gb": memory.total / 1024**3,
+            "used_gb": memory.used / 1024**3,
+            "available_gb": memory.available / 1024**3,
+            "percent": memory.percent
+        },
+        "disk": {
+            "total_gb": disk.total / 1024**3,
+            "used_gb": disk.used / 1024**3,
+            "free_gb": disk.free / 1024**3,
+            "percent": (disk.used / disk.total) * 100
         }
-    except Exception as e:
-        logger.error(f"Health check failed: {str(e)}")
-        raise HTTPException(status_code=503, detail="Service unavailable")
+    }
+
+def _collect_gpu_info() -> Dict[str, Any]:
+    """GPU availability and memory usage"""
+    if not CUDA_AVAILABLE:
+        return {"available": False}
+    
+    allocated, reserved = _gpu_memory_cached()
+    return {
+        "available": True,
+        "device_count": GPU_DEVICE_COUNT,
+        "current_device": torch.cuda.current_device(),
+        "device_name": GPU_DEVICE_NAME,
+        "memory_total_gb": GPU_TOTAL_MEMORY / 1024**3,
+        "memory_allocated_gb": allocated / 1024**3,
+        "memory_cached_gb": reserved / 1024**3
+    }
+
+def _collect_model_info() -> Dict[str, Any]:
+    """Loaded model information"""
+    try:
+        return model_manager.get_model_info()
+    except:
+        return {"error": "Model manager not accessible"}
+
+async def _collect_detailed_health() -> Dict[str, Any]:
+    """Assemble the detailed health payload, running the independent probes concurrently"""
+    system_info, gpu_info, model_info = await asyncio.gather(
+        asyncio.to_thread(_collect_system_info),
+        asyncio.to_thread(_collect_gpu_info),
+        asyncio.to_thread(_collect_model_info)
+    )
+    
+    return {
+        **HEALTH_PAYLOAD,
+        "timestamp": time.time(),
+        "system": system_info,
+        "gpu": gpu_info,
+        "models": model_info,
+        "environment": ENVIRONMENT_INFO
+    }
 
 @router.get("/health/detailed")
 async def detailed_health_check():
     """Detailed health check with system information"""
     try:
-        # System information
-        memory = psutil.virtual_memory()
-        cpu_percent = psutil.cpu_percent(interval=1)
-        disk = psutil.disk_usage('/')
-        
-        # GPU information
-        gpu_info = {}
-        if torch.cuda.is_available():
-            gpu_info = {
-                "available": True,
-                "device_count": torch.cuda.device_count(),
-                "current_device": torch.cuda.current_device(),
-                "device_name": torch.cuda.get_device_name(0),
-                "memory_total_gb": torch.cuda.get_device_properties(0).total_memory / 1024**3,
-                "memory_allocated_gb": torch.cuda.memory_allocated(0) / 1024**3,
-                "memory_cached_gb": torch.cuda.memory_reserved(0) / 1024**3
-            }
-        else:
-            gpu_info = {"available": False}
-        
-        # Model information
-        try:
-            model_info = model_manager.get_model_info()
-        except:
-            model_info = {"error": "Model manager not accessible"}
-        
-        return {
-            "status": "healthy",
-            "service": "SummarizePro API",
-            "version": "2.0.0",
-            "timestamp": time.time(),
-            "system": {
-                "cpu_percent": cpu_percent,
-                "memory": {
-                    "total_gb": memory.total / 1024**3,
-                    "used_gb": memory.used / 1024**3,
-                    "available_gb": memory.available / 1024**3,
-                    "percent": memory.percent
-                },
-                "disk": {
-                    "total_gb": disk.total / 1024**3,
-                    "used_gb": disk.used / 1024**3,
-                    "free_gb": disk.free / 1024**3,
-                    "percent": (disk.used / disk.total) * 100
-                }
-            },
-            "gpu": gpu_info,
-            "models": model_info,
-            "environment": {
-                "python_version": f"{psutil.sys.version_info.major}.{psutil.sys.version_info.minor}.{psutil.sys.version_info.micro}",
-                "torch_version": torch.__version__,
-                "cuda_version": torch.version.cuda if torch.cuda.is_available() else None
-            }
-        }
+        # Probe traffic is served from a short-lived snapshot, encoded once per refresh
+        if time.monotonic() - _detailed_health_cache["time"] >= DETAILED_HEALTH_TTL:
+            async with _detailed_health_lock:
+                # Another request may have refreshed the snapshot while we waited
+                if time.monotonic() - _detailed_health_cache["time"] >= DETAILED_HEALTH_TTL:
+                    _detailed_health_cache["payload"] = orjson.dumps(await _collect_detailed_health())
+                    _detailed_health_cache["time"] = time.monotonic()
+        
+        return Response(content=_detailed_health_cache["payload"], media_type="application/json")
     except Exception as e:
         logger.error(f"Detailed health check failed: {str(e)}")
         raise HTTPException(status_code=503, detail=f"Service check failed: {str(e)}")
 
 @router.get("/health/models")
-async def models_status():
+def models_status():
     """Get status of all AI models"""
     try:
         model_info = model_manager.get_model_info()
@@ -110,9 +218,25 @@ async def models_status():
         logger.error(f"Model status check failed: {str(e)}")
         raise HTTPException(status_code=503, detail=f"Model status unavailable: {str(e)}")
 
+CACHE_CLEAR_INTERVAL = 60  # seconds
+_last_cache_clear = float("-inf")
+_cache_clear_lock = threading.Lock()
+
 @router.post("/health/models/clear-cache")
-async def clear_model_cache():
+def clear_model_cache():
     """Clear model cache to free memory"""
+    # empty_cache() synchronizes the device and stalls live inference, so allow it once a minute
+    global _last_cache_clear
+    with _cache_clear_lock:
+        retry_after = CACHE_CLEAR_INTERVAL - (time.monotonic() - _last_cache_clear)
+        if retry_after > 0:
+            raise HTTPException(
+                status_code=429,
+                detail=f"Model cache was cleared recently; retry in {int(retry_after) + 1}s",
+                headers={"Retry-After": str(int(retry_after) + 1)}
+            )
+        _last_cache_clear = time.monotonic()
+    
     try:
         model_manager.clear_cache()
         return {
@@ -124,35 +248,54 @@ async def clear_model_cache():
         logger.error(f"Failed to clear model cache: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to clear cache: {str(e)}")
 
-@router.get("/health/dependencies")
-async def check_dependencies():
-    """Check if all required dependencies are available"""
-    dependencies = {}
-    
-    # Check FFmpeg
+# Dependency availability rarely changes, so /health/dependencies results are reused briefly
+DEPENDENCY_CACHE_TTL = 30
+_dependencies_cache = {"time": float("-inf"), "payload": None}
+
+DEPENDENCY_PACKAGES = [
+    'torch', 'transformers', 'sentence_transformers', 
+    'keybert', 'bertopic', 'whisper', 'fastapi', 'uvicorn'
+]
+
+@lru_cache(maxsize=1)
+def _check_ffmpeg() -> Dict[str, Any]:
+    """Probe the ffmpeg binary once; cleared via /health/dependencies/refresh"""
     try:
         import subprocess
         result = subprocess.run(['ffmpeg', '-version'], capture_output=True, text=True, timeout=5)
-        dependencies['ffmpeg'] = {
+        return {
             "available": result.returncode == 0,
             "version": result.stdout.split('\n')[0] if result.returncode == 0 else None
         }
     except:
-        dependencies['ffmpeg'] = {"available": False, "error": "Not found or not accessible"}
+        return {"available": False, "error": "Not found or not accessible"}
+
+# Import names whose installed distribution is published under a different name
+_DISTRIBUTION_NAMES = {
+    'sentence_transformers': 'sentence-transformers',
+    'whisper': 'openai-whisper'
+}
+
+def _check_package(package: str) -> Dict[str, Any]:
+    """Probe a Python package from its installed metadata, without importing it"""
+    try:
+        version = importlib.metadata.version(_DISTRIBUTION_NAMES.get(package, package))
+        return {"available": True, "version": version}
+    except importlib.metadata.PackageNotFoundError:
+        return {"available": False, "error": "Not installed"}
+
+@router.get("/health/dependencies")
+async def check_dependencies():
+    """Check if all required dependencies are available"""
+    if time.monotonic() - _dependencies_cache["time"] < DEPENDENCY_CACHE_TTL:
+        return _dependencies_cache["payload"]
     
-    # Check key Python packages
-    packages_to_check = [
-        'torch', 'transformers', 'sentence_transformers', 
-        'keybert', 'bertopic', 'whisper', 'fastapi', 'uvicorn'
+    # Run every probe on its own thread so total latency is the slowest check, not the sum
+    checks = [("ffmpeg", _check_ffmpeg)] + [
+        (package, partial(_check_package, package)) for package in DEPENDENCY_PACKAGES
     ]
-    
-    for package in packages_to_check:
-        try:
-            module = __import__(package)
-            version = getattr(module, '__version__', 'unknown')
-            dependencies[package] = {"available": True, "version": version}
-        except ImportError:
-            dependencies[package] = {"available": False, "error": "Not installed"}
+    results = await asyncio.gather(*(asyncio.to_thread(check) for _, check in checks))
+    dependencies = {name: result for (name, _), result in zip(checks, results)}
     
     # Overall status
     all_critical_available = all(
@@ -160,44 +303,81 @@ async def check_dependencies():
         for pkg in ['torch', 'transformers', 'fastapi']
     )
     
-    return {
+    payload = {
         "status": "ok" if all_critical_available else "warning",
         "dependencies": dependencies,
         "timestamp": time.time()
     }
+    _dependencies_cache.update(time=time.monotonic(), payload=payload)
+    return payload
 
-@router.get("/health/performance")
-async def performance_metrics():
-    """Get performance metrics and benchmarks"""
-    try:
-        # Simple performance test
-        start_time = time.time()
-        
-        # Test basic computation
-        if torch.cuda.is_available():
-            device = torch.device('cuda')
-            x = torch.randn(1000, 1000, device=device)
-            y = torch.mm(x, x.t())
-            torch.cuda.synchronize()
+@router.post("/health/dependencies/refresh")
+async def refresh_dependencies():
+    """Drop cached dependency probes so the next check re-runs them"""
+    _check_ffmpeg.cache_clear()
+    _dependencies_cache.update(time=float("-inf"), payload=None)
+    return {
+        "status": "success",
+        "message": "Dependency cache cleared",
+        "timestamp": time.time()
+    }
+
+# Matmul benchmark state: one warm input tensor and the latest timing, rerun at most once a minute
+BENCHMARK_CACHE_TTL = 60
+_bench_tensor = None
+_bench_result = {"matrix_multiplication_ms": None, "timestamp": None}
+_bench_lock = threading.Lock()
+
+def _run_matmul_benchmark() -> Dict[str, Any]:
+    """Time a 1000x1000 matmul on a reused tensor, refreshing the cached result if stale"""
+    global _bench_tensor
+    with _bench_lock:
+        last_run = _bench_result["timestamp"]
+        if last_run is not None and time.time() - last_run < BENCHMARK_CACHE_TTL:
+            return _bench_result
+        
+        if _bench_tensor is None:
+            device = torch.device('cuda' if CUDA_AVAILABLE else 'cpu')
+            _bench_tensor = torch.randn(1000, 1000, device=device)
+        x = _bench_tensor
+        
+        if x.is_cuda:
+            # CUDA events time the kernel itself without a device-wide synchronize()
+            start_event = torch.cuda.Event(enable_timing=True)
+            end_event = torch.cuda.Event(enable_timing=True)
+            start_event.record()
+            torch.mm(x, x.t())
+            end_event.record()
+            end_event.synchronize()
+            elapsed_ms = start_event.elapsed_time(end_event)
         else:
-            x = torch.randn(1000, 1000)
-            y = torch.mm(x, x.t())
+            start_time = time.perf_counter()
+            torch.mm(x, x.t())
+            elapsed_ms = (time.perf_counter() - start_time) * 1000
         
-        computation_time = time.time() - start_time
+        _bench_result.update(matrix_multiplication_ms=elapsed_ms, timestamp=time.time())
+        return _bench_result
+
+@router.get("/health/performance")
+def performance_metrics(run: bool = False):
+    """Get performance metrics; the matmul benchmark only runs when ?run=true"""
+    try:
+        bench = _run_matmul_benchmark() if run else _bench_result
         
         return {
             "status": "ok",
             "metrics": {
-                "matrix_multiplication_ms": computation_time * 1000,
-                "device_used": "cuda" if torch.cuda.is_available() else "cpu",
+                "matrix_multiplication_ms": bench["matrix_multiplication_ms"],
+                "measured_at": bench["timestamp"],
+                "device_used": "cuda" if CUDA_AVAILABLE else "cpu",
                 "timestamp": time.time()
             },
             "system_load": {
-                "cpu_percent": psutil.cpu_percent(),
-                "memory_percent": psutil.virtual_memory().percent,
+                "cpu_percent": _last_cpu_percent,
+                "memory_percent": _virtual_memory().percent,
                 "gpu_memory_percent": (
-                    (torch.cuda.memory_allocated(0) / torch.cuda.get_device_properties(0).total_memory) * 100
-                    if torch.cuda.is_available() else None
+                    (_gpu_memory_cached()[0] / GPU_TOTAL_MEMORY) * 100
+                    if CUDA_AVAILABLE else None
                 )
             }
         }
@@ -205,24 +385,118 @@ async def performance_metrics():
         logger.error(f"Performance check failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Performance check failed: {str(e)}")
 
-@router.get("/health/test-summarization")
-async def test_summarization():
-    """Test document summarization functionality"""
-    try:
-        from app.services.summarizer import summarizer
-        
-        # Simple test text
-        test_text = """
+# Fixed sample inputs for the /health/test-* diagnostics, built once at import
+
+# Simple test text
+TEST_TEXT = """
         This is a test document for the summarization system. 
         It contains multiple sentences to verify that the BART model 
         can properly process and summarize content. The system should 
         be able to generate a concise summary that captures the main 
         points of the original text while maintaining readability and coherence.
         """
+
+# Sample garbled text similar to what the user experienced
+GARBLED_TEST_TEXT = """
+        ExecutingExecuting Executing ExecutesExecutingexecutingExecutesExecutes ExecutingExecuteExecutingExecutiveExecuting ExecutiveExecutingEager to contribute to impactful projects and grow in a dynamic, team-oriented environment.ExecutionExecuting ExecutionExecution Executes ExecuteExecution ExecutionExecutingProfession SummaryExecutingBachelor of Engineering, Computer Science, 8.25(CGPA) Aug 2022– PresentExecution SummaryExecutionConfigurationsExecution ExampleExecutionExampleExecution AttributesExecution ExamplesExecution DescriptionExecution:Execution OfficerExecution SupervisorExecutionerExecutionaryExecution DetailsExecutionDetailsExecution ProfileExecutionersExecutionershipExecution ActionsExecutionDescriptionExecutionCmdistryExecution ResultsExecution ParametersExecutionParametersExecuting ParametersExecuting ActionsExecuting AttributesExecuting AbilitiesExecuting APIsExecuting FunctionsExecuting EffectsExecuting AI modelExecuting MIDI data into structured sequences for training and testing.ExecutingModel parametersExecuting Model parameters to improve composition quality and variation.ExecutionsExecution•MERN Chat Application /githubithubExecutingEmailsExecuting: SQL,MongoDB, Express.js, React.js,, Node.js , Socket.IOExecutingDeveloped a full-stack real-time chat app enabling instant messaging between users.
+        """
+
+# Sample documents of different types including garbled text
+UNIVERSAL_TEST_DOCUMENTS = MappingProxyType({
+    "business": """
+            QUARTERLY BUSINESS REVIEW
+            Our company achieved significant milestones in Q3 2023. Revenue reached $3.2 million, 
+            representing a 22% increase from the previous quarter. The sales team exceeded targets 
+            by 15%, primarily driven by strong performance in the enterprise segment. Key achievements 
+            include launching a new product line, expanding the team by 25 employees, and establishing 
+            partnerships with three major distributors. Moving forward, we will focus on operational 
+            efficiency improvements and market expansion in the Asia-Pacific region.
+            """,
+            
+    "technical": """
+            API DOCUMENTATION
+            The application follows a microservices architecture with authentication service handling 
+            user login/logout using JWT tokens and PostgreSQL database. The data processing API provides 
+            RESTful endpoints for data manipulation, supports JSON and XML formats, and implements 
+            rate limiting of 1000 requests per hour. Installation requires cloning the repository, 
+            running npm install, configuring environment variables, and starting the server.
+            """,
+            
+    "garbled_professional": """
+            Â Â ï John Smith +1-555-0123 | john@email.com ï LinkedIn کی بیی نی ایمی مینیگ
+            Bachelor of Computer Science, MIT, 3.8 GPA 2020-2024
+            Projects: Machine Learning Model Python, TensorFlow Built predictive analytics system.
+            Experience: Software Engineer at TechCorp 2024-Present Developed scalable web applications.
+            Skills: Python, JavaScript, React, Node.js, AWS, Docker
+            """
+})
+
+# Various document types used to show universal PDF processing
+PDF_TEST_DOCUMENTS = MappingProxyType({
+    "technical_manual": """
+            Installation Guide for Software System
+            Prerequisites: Python 3.8+, Node.js 16+
+            Step 1: Download the package from repository
+            Step 2: Extract files to installation directory  
+            Step 3: Run setup.py install command
+            Configuration: Edit config.json file with your settings
+            Troubleshooting: Check logs in /var/log/app.log for errors
+            """,
+            
+    "business_report": """
+            Q3 Financial Performance Report
+            Revenue increased by 15% compared to Q2
+            Operating expenses reduced by 8% through efficiency improvements
+            Customer acquisition cost decreased by 12%
+            Market share expanded in Asia-Pacific region
+            Recommendations: Invest in digital transformation initiatives
+            Risk factors: Supply chain disruptions, regulatory changes
+            """,
+            
+    "academic_paper": """
+            Abstract: This study investigates the impact of machine learning
+            on data processing efficiency. Methods included comparative analysis
+            of traditional algorithms versus ML approaches. Results showed 
+            40% improvement in processing speed. Discussion covers implications
+            for enterprise applications. Conclusion: ML significantly enhances
+            data processing capabilities across multiple domains.
+            """,
+            
+    "garbled_text": """
+            Â Â This is Â garbled text with: broken words and
+            repeated repeated phrases. There are _____ formatting artifacts
+            and strange: characters that need cleaning. The summary: should
+            not include garbage prefixes like "Summarize this document" or
+            "Write a comprehensive summary" at the beginning.
+            """
+})
+
+# Sample academic text (similar to user's example)
+ACADEMIC_TEST_TEXT = """
+        Text Summarization is a subset of Natural Language Processing (NLP) and is the process of shortening the source text or set of text documents while retaining the main information content. The main aim of text summarization is to create a reduced version of the text preserving its essential information. Due to globalization, there are vast amounts of data available in various forms and genres. There is an intense need to summarize data and information for humans. Majority of research work done so far has generated summarization systems which are extractive, while some work has been done in abstractive summarization as the latter is harder to develop and requires in-depth knowledge of linguistics. Abstractive summarization requires a deeper understanding of linguistic skills and semantic understanding of the content, making it more challenging to implement than extractive methods.
+        """
+
+@lru_cache(maxsize=1)
+def _cleaned_academic_text():
+    """Cleaned ACADEMIC_TEST_TEXT and its lowercase word set"""
+    from app.services.text_extractor import text_extractor
+    
+    cleaned_text = text_extractor.clean_text(ACADEMIC_TEST_TEXT)
+    return cleaned_text, frozenset(cleaned_text.lower().split())
+
+def _preview(text: str, limit: int = 300) -> str:
+    """Truncate diagnostic text so responses stay small"""
+    return text[:limit] + "..." if len(text) > limit else text
+
+@test_router.get("/health/test-summarization")
+def test_summarization():
+    """Test document summarization functionality"""
+    try:
+        from app.services.summarizer import summarizer
         
         # Test summarization
         summary = summarizer.summarize_document(
-            text=test_text,
+            text=TEST_TEXT,
             max_length=50,
             min_length=20,
             summary_style="detailed",
@@ -232,7 +506,7 @@ async def test_summarization():
         return {
             "status": "success",
             "test_passed": True,
-            "original_length": len(test_text.split()),
+            "original_length": len(TEST_TEXT.split()),
             "summary_length": len(summary.split()),
             "summary": summary,
             "timestamp": time.time()
@@ -247,26 +521,21 @@ async def test_summarization():
             "timestamp": time.time()
         }
 
-@router.get("/health/test-text-cleaning")
-async def test_text_cleaning():
+@test_router.get("/health/test-text-cleaning")
+def test_text_cleaning():
     """Test text cleaning functionality with sample garbled text"""
     try:
         from app.services.text_extractor import text_extractor
-        
-        # Sample garbled text similar to what the user experienced
-        garbled_text = """
-        ExecutingExecuting Executing ExecutesExecutingexecutingExecutesExecutes ExecutingExecuteExecutingExecutiveExecuting ExecutiveExecutingEager to contribute to impactful projects and grow in a dynamic, team-oriented environment.ExecutionExecuting ExecutionExecution Executes ExecuteExecution ExecutionExecutingProfession SummaryExecutingBachelor of Engineering, Computer Science, 8.25(CGPA) Aug 2022– PresentExecution SummaryExecutionConfigurationsExecution ExampleExecutionExampleExecution AttributesExecution ExamplesExecution DescriptionExecution:Execution OfficerExecution SupervisorExecutionerExecutionaryExecution DetailsExecutionDetailsExecution ProfileExecutionersExecutionershipExecution ActionsExecutionDescriptionExecutionCmdistryExecution ResultsExecution ParametersExecutionParametersExecuting ParametersExecuting ActionsExecuting AttributesExecuting AbilitiesExecuting APIsExecuting FunctionsExecuting EffectsExecuting AI modelExecuting MIDI data into structured sequences for training and testing.ExecutingModel parametersExecuting Model parameters to improve composition quality and variation.ExecutionsExecution•MERN Chat Application /githubithubExecutingEmailsExecuting: SQL,MongoDB, Express.js, React.js,, Node.js , Socket.IOExecutingDeveloped a full-stack real-time chat app enabling instant messaging between users.
-        """
+        from app.services.summarizer import summarizer
         
         # Test cleaning
-        original_length = len(garbled_text)
-        cleaned_text = text_extractor.clean_resume_text(garbled_text)
+        original_length = len(GARBLED_TEST_TEXT)
+        cleaned_text = text_extractor.clean_resume_text(GARBLED_TEST_TEXT)
         cleaned_length = len(cleaned_text)
         
         # Test summarization with cleaned text
         summary = ""
         if len(cleaned_text.split()) > 10:
-            from app.services.summarizer import summarizer
             summary = summarizer.summarize_document(
                 text=cleaned_text,
                 max_length=100,
@@ -281,7 +550,7 @@ async def test_text_cleaning():
             "original_length": original_length,
             "cleaned_length": cleaned_length,
             "reduction_percentage": round((original_length - cleaned_length) / original_length * 100, 2),
-            "cleaned_text_preview": cleaned_text[:300] + "..." if len(cleaned_text) > 300 else cleaned_text,
+            "cleaned_text_preview": _preview(cleaned_text),
             "summary": summary,
             "timestamp": time.time()
         }
@@ -295,20 +564,14 @@ async def test_text_cleaning():
             "timestamp": time.time()
         }
 
-@router.get("/health/test-abstractive-summarization")
-async def test_abstractive_summarization():
+@test_router.get("/health/test-abstractive-summarization")
+def test_abstractive_summarization():
     """Test enhanced abstractive summarization capabilities"""
     try:
         from app.services.summarizer import summarizer
-        from app.services.text_extractor import text_extractor
         
-        # Sample academic text (similar to user's example)
-        academic_text = """
-        Text Summarization is a subset of Natural Language Processing (NLP) and is the process of shortening the source text or set of text documents while retaining the main information content. The main aim of text summarization is to create a reduced version of the text preserving its essential information. Due to globalization, there are vast amounts of data available in various forms and genres. There is an intense need to summarize data and information for humans. Majority of research work done so far has generated summarization systems which are extractive, while some work has been done in abstractive summarization as the latter is harder to develop and requires in-depth knowledge of linguistics. Abstractive summarization requires a deeper understanding of linguistic skills and semantic understanding of the content, making it more challenging to implement than extractive methods.
-        """
-        
-        # Clean the text
-        cleaned_text = text_extractor.clean_text(academic_text)
+        # Clean the text (deterministic, so cleaned once per process)
+        cleaned_text, original_words = _cleaned_academic_text()
         
         # Test adaptive length summarization
         summary = summarizer.summarize_document(
@@ -320,8 +583,7 @@ async def test_abstractive_summarization():
         )
         
         # Calculate abstractive quality metrics
-        original_words = set(cleaned_text.lower().split())
-        summary_words = set(summary.lower().split())
+        summary_words = frozenset(summary.lower().split())
         word_overlap = len(original_words.intersection(summary_words)) / len(summary_words) if summary_words else 0
         compression_ratio = (1 - len(summary.split()) / len(cleaned_text.split())) * 100
         
@@ -352,49 +614,19 @@ async def test_abstractive_summarization():
             "timestamp": time.time()
         }
 
-@router.get("/health/test-universal-summarization")
-async def test_universal_summarization():
+@test_router.get("/health/test-universal-summarization")
+def test_universal_summarization():
     """Test universal document summarization across different document types"""
     try:
         from app.services.summarizer import summarizer
         from app.services.text_extractor import text_extractor
         
-        # Sample documents of different types including garbled text
-        test_documents = {
-            "business": """
-            QUARTERLY BUSINESS REVIEW
-            Our company achieved significant milestones in Q3 2023. Revenue reached $3.2 million, 
-            representing a 22% increase from the previous quarter. The sales team exceeded targets 
-            by 15%, primarily driven by strong performance in the enterprise segment. Key achievements 
-            include launching a new product line, expanding the team by 25 employees, and establishing 
-            partnerships with three major distributors. Moving forward, we will focus on operational 
-            efficiency improvements and market expansion in the Asia-Pacific region.
-            """,
-            
-            "technical": """
-            API DOCUMENTATION
-            The application follows a microservices architecture with authentication service handling 
-            user login/logout using JWT tokens and PostgreSQL database. The data processing API provides 
-            RESTful endpoints for data manipulation, supports JSON and XML formats, and implements 
-            rate limiting of 1000 requests per hour. Installation requires cloning the repository, 
-            running npm install, configuring environment variables, and starting the server.
-            """,
-            
-            "garbled_professional": """
-            Â Â ï John Smith +1-555-0123 | john@email.com ï LinkedIn کی بیی نی ایمی مینیگ
-            Bachelor of Computer Science, MIT, 3.8 GPA 2020-2024
-            Projects: Machine Learning Model Python, TensorFlow Built predictive analytics system.
-            Experience: Software Engineer at TechCorp 2024-Present Developed scalable web applications.
-            Skills: Python, JavaScript, React, Node.js, AWS, Docker
-            """
-        }
-        
         results = {}
         
         import io
         import contextlib
         
-        for doc_type, content in test_documents.items():
+        for doc_type, content in UNIVERSAL_TEST_DOCUMENTS.items():
             # Test automatic detection and summarization with warning suppression
             detected_type = text_extractor.detect_document_type(content.lower())
             
@@ -417,7 +649,7 @@ async def test_universal_summarization():
                 "detection_correct": detected_type in doc_type or doc_type == "garbled_professional",
                 "original_length": len(content.split()),
                 "summary_length": len(summary.split()),
-                "summary": summary[:200] + "..." if len(summary) > 200 else summary,
+                "summary": _preview(summary, 200),
                 "warnings_suppressed": 'max_length' not in captured_warnings,
                 "has_garbled_artifacts": 'ï' in content or 'Â' in content,
                 "artifacts_cleaned": 'ï' not in summary and 'Â' not in summary
@@ -432,7 +664,7 @@ async def test_universal_summarization():
             "test_passed": True,
             "detection_accuracy": round(detection_accuracy, 1),
             "average_compression_ratio": round(avg_compression, 1),
-            "document_types_tested": list(test_documents.keys()),
+            "document_types_tested": list(UNIVERSAL_TEST_DOCUMENTS.keys()),
             "results": results,
             "capabilities": [
                 "Universal document processing",
@@ -461,8 +693,8 @@ async def test_universal_summarization():
         }
 
 
-@router.get("/health/test-model-fixes")
-async def test_model_fixes():
+@test_router.get("/health/test-model-fixes")
+def test_model_fixes():
     """Test that all model loading and processing issues are fixed"""
     try:
         from app.services.summarizer import summarizer
@@ -496,7 +728,7 @@ async def test_model_fixes():
                 "status": "success",
                 "time_seconds": round(summarization_time, 2),
                 "summary_length": len(summary.split()),
-                "summary": summary[:150] + "..." if len(summary) > 150 else summary
+                "summary": _preview(summary, 150)
             }
         except Exception as e:
             results["summarization"] = {
@@ -560,8 +792,8 @@ async def test_model_fixes():
             "timestamp": time.time()
         }
 
-@router.get("/health/test-resume-cleaning")
-async def test_resume_cleaning():
+@test_router.get("/health/test-resume-cleaning")
+def test_resume_cleaning():
     """Test resume cleaning with garbled text provided by user"""
     try:
         from app.services.text_extractor import text_extractor
@@ -582,14 +814,14 @@ async def test_resume_cleaning():
         results["resume_cleaning"] = {
             "original_length": len(garbled_resume),
             "cleaned_length": len(resume_cleaned),
-            "cleaned_text": resume_cleaned
+            "cleaned_text": _preview(resume_cleaned)
         }
         
         # Step 3: Document-type cleaning
         doc_cleaned = text_extractor.clean_document_by_type(garbled_resume, doc_type)
         results["document_type_cleaning"] = {
             "cleaned_length": len(doc_cleaned),
-            "cleaned_text": doc_cleaned
+            "cleaned_text": _preview(doc_cleaned)
         }
         
         # Step 4: Generate professional summary
@@ -627,7 +859,7 @@ async def test_resume_cleaning():
         
         return {
             "status": "success",
-            "original_text_preview": garbled_resume[:100] + "...",
+            "original_text_preview": _preview(garbled_resume, 100),
             "issues_found": issues_found,
             "needs_improvement": len(issues_found) > 0,
             "results": results,
@@ -648,64 +880,31 @@ async def test_resume_cleaning():
             "timestamp": time.time()
         }
 
-@router.get("/health/test-universal-pdf-processing")
-async def test_universal_pdf_processing():
+# Instruction echoes that indicate a summary leaked its prompt
+INSTRUCTION_PREFIXES = (
+    "write a", "create a", "provide a", "summarize this",
+    "explain the", "this document", "the following"
+)
+_INSTRUCTION_PREFIX_SPAN = max(map(len, INSTRUCTION_PREFIXES))
+
+@test_router.get("/health/test-universal-pdf-processing")
+def test_universal_pdf_processing():
     """Test universal PDF processing with garbage text removal and efficiency improvements"""
     try:
         from app.services.text_extractor import text_extractor
         from app.services.summarizer import summarizer
-        import time
-        
-        # Test with various document types to show universality
-        test_documents = {
-            "technical_manual": """
-            Installation Guide for Software System
-            Prerequisites: Python 3.8+, Node.js 16+
-            Step 1: Download the package from repository
-            Step 2: Extract files to installation directory  
-            Step 3: Run setup.py install command
-            Configuration: Edit config.json file with your settings
-            Troubleshooting: Check logs in /var/log/app.log for errors
-            """,
-            
-            "business_report": """
-            Q3 Financial Performance Report
-            Revenue increased by 15% compared to Q2
-            Operating expenses reduced by 8% through efficiency improvements
-            Customer acquisition cost decreased by 12%
-            Market share expanded in Asia-Pacific region
-            Recommendations: Invest in digital transformation initiatives
-            Risk factors: Supply chain disruptions, regulatory changes
-            """,
-            
-            "academic_paper": """
-            Abstract: This study investigates the impact of machine learning
-            on data processing efficiency. Methods included comparative analysis
-            of traditional algorithms versus ML approaches. Results showed 
-            40% improvement in processing speed. Discussion covers implications
-            for enterprise applications. Conclusion: ML significantly enhances
-            data processing capabilities across multiple domains.
-            """,
-            
-            "garbled_text": """
-            Â Â This is Â garbled text with: broken words and
-            repeated repeated phrases. There are _____ formatting artifacts
-            and strange: characters that need cleaning. The summary: should
-            not include garbage prefixes like "Summarize this document" or
-            "Write a comprehensive summary" at the beginning.
-            """
-        }
         
         results = {}
-        total_start_time = time.time()
+        total_start_time = time.perf_counter()
         
-        for doc_type, content in test_documents.items():
-            doc_start_time = time.time()
+        for doc_type, content in PDF_TEST_DOCUMENTS.items():
+            doc_start_time = time.perf_counter()
             
             # Step 1: Text cleaning
             cleaned_text = text_extractor.clean_text(content)
             
             # Step 2: Summarization with garbage text removal
+            # Model load failures surface as bare Exception, so this stays broad but covers only the call
             try:
                 summary = summarizer.summarize_document(
                     text=cleaned_text,
@@ -714,34 +913,31 @@ async def test_universal_pdf_processing():
                     summary_type="comprehensive",
                     summary_style="detailed"
                 )
-                
-                processing_time = time.time() - doc_start_time
-                
-                # Check for garbage text at beginning
-                garbage_detected = any(summary.lower().startswith(prefix.lower()) for prefix in [
-                    "write a", "create a", "provide a", "summarize this", 
-                    "explain the", "this document", "the following"
-                ])
-                
-                results[doc_type] = {
-                    "status": "success",
-                    "processing_time_seconds": round(processing_time, 2),
-                    "original_length": len(content),
-                    "cleaned_length": len(cleaned_text),
-                    "summary_length": len(summary),
-                    "garbage_text_detected": garbage_detected,
-                    "summary": summary,
-                    "cleaning_effective": len(cleaned_text) < len(content)
-                }
-                
             except Exception as e:
                 results[doc_type] = {
                     "status": "error",
                     "error": str(e),
-                    "processing_time_seconds": round(time.time() - doc_start_time, 2)
+                    "processing_time_seconds": round(time.perf_counter() - doc_start_time, 2)
                 }
+                continue
+            
+            processing_time = time.perf_counter() - doc_start_time
+            
+            # Check for garbage text at beginning; only the leading span needs lowercasing
+            garbage_detected = summary[:_INSTRUCTION_PREFIX_SPAN].lower().startswith(INSTRUCTION_PREFIXES)
+            
+            results[doc_type] = {
+                "status": "success",
+                "processing_time_seconds": round(processing_time, 2),
+                "original_length": len(content),
+                "cleaned_length": len(cleaned_text),
+                "summary_length": len(summary),
+                "garbage_text_detected": garbage_detected,
+                "summary": summary,
+                "cleaning_effective": len(cleaned_text) < len(content)
+            }
         
-        total_processing_time = time.time() - total_start_time
+        total_processing_time = time.perf_counter() - total_start_time
         
         # Overall assessment
         successful_docs = sum(1 for r in results.values() if r.get("status") == "success")
@@ -751,7 +947,7 @@ async def test_universal_pdf_processing():
         return {
             "status": "success",
             "universal_processing": True,
-            "documents_tested": len(test_documents),
+            "documents_tested": len(PDF_TEST_DOCUMENTS),
             "successful_processing": successful_docs,
             "garbage_text_removed": no_garbage_text == successful_docs,
             "fast_processing": fast_processing,
@@ -775,16 +971,8 @@ async def test_universal_pdf_processing():
             "timestamp": time.time()
         }
 
-@router.get("/health/test-large-document-processing")
-async def test_large_document_processing():
-    """Test processing of large documents to identify frontend timeout issues"""
-    try:
-        from app.services.text_extractor import text_extractor
-        from app.services.summarizer import summarizer
-        import time
-        
-        # Simulate a large document (like your notes/bigger documents)
-        large_document = """
+# Simulated large document (like notes/bigger documents) for the timeout test
+LARGE_TEST_DOCUMENT = """
         Chapter 1: Introduction to Advanced Data Science
         
         Data science has evolved significantly over the past decade, transforming from a niche field 
@@ -863,38 +1051,75 @@ async def test_large_document_processing():
         innovation, and data availability. Successful practitioners must maintain continuous learning 
         mindsets, stay current with technological developments, and cultivate strong collaborative 
         relationships across organizational boundaries.
-        """ * 3  # Make it even larger to simulate your big documents
-        
-        start_time = time.time()
-        
-        # Step 1: Text cleaning
-        logger.info("Starting large document processing test")
-        cleaned_text = text_extractor.clean_text(large_document)
-        cleaning_time = time.time() - start_time
-        
-        # Step 2: Summarization
-        summary_start = time.time()
+        """ * 3  # Make it even larger to simulate big documents
+LARGE_TEST_DOCUMENT_CHARS = len(LARGE_TEST_DOCUMENT)
+LARGE_TEST_DOCUMENT_WORDS = len(LARGE_TEST_DOCUMENT.split())
+
+@test_router.get("/health/test-large-document-processing")
+async def test_large_document_processing():
+    """Test processing of large documents, streaming each stage as NDJSON to avoid frontend timeouts"""
+    
+    def ndjson(payload: Dict[str, Any]) -> bytes:
+        return orjson.dumps({**payload, "timestamp": time.time()}) + b"\n"
+    
+    async def stages():
         try:
-            summary = summarizer.summarize_document(
-                text=cleaned_text,
-                max_length=200,
-                min_length=50,
-                summary_type="comprehensive",
-                summary_style="detailed"
-            )
-            summary_time = time.time() - summary_start
-            total_time = time.time() - start_time
+            from app.services.text_extractor import text_extractor
+            from app.services.summarizer import summarizer
+            
+            start_time = time.perf_counter()
+            
+            # Step 1: Text cleaning
+            logger.info("Starting large document processing test")
+            yield ndjson({
+                "stage": "cleaning_started",
+                "original_length_chars": LARGE_TEST_DOCUMENT_CHARS,
+                "original_word_count": LARGE_TEST_DOCUMENT_WORDS
+            })
+            cleaned_text = await asyncio.to_thread(text_extractor.clean_text, LARGE_TEST_DOCUMENT)
+            cleaning_time = time.perf_counter() - start_time
+            cleaned_word_count = len(cleaned_text.split())
+            yield ndjson({
+                "stage": "cleaning_completed",
+                "cleaned_length_chars": len(cleaned_text),
+                "cleaned_word_count": cleaned_word_count,
+                "text_cleaning_seconds": round(cleaning_time, 2)
+            })
+            
+            # Step 2: Summarization
+            summary_start = time.perf_counter()
+            try:
+                summary = await asyncio.to_thread(partial(
+                    summarizer.summarize_document,
+                    text=cleaned_text,
+                    max_length=200,
+                    min_length=50,
+                    summary_type="comprehensive",
+                    summary_style="detailed"
+                ))
+            except Exception as summary_error:
+                yield ndjson({
+                    "stage": "summarization_failed",
+                    "status": "error",
+                    "error": str(summary_error),
+                    "processing_time_before_error": round(time.perf_counter() - start_time, 2),
+                    "issue": "Summarization failed - this explains why frontend gets no response"
+                })
+                return
+            summary_time = time.perf_counter() - summary_start
+            total_time = time.perf_counter() - start_time
             
             # Check if summary is valid
             summary_valid = len(summary.strip()) > 20 and not summary.startswith("Failed")
             
-            return {
+            yield ndjson({
+                "stage": "completed",
                 "status": "success",
                 "large_document_processing": True,
-                "original_length_chars": len(large_document),
+                "original_length_chars": LARGE_TEST_DOCUMENT_CHARS,
                 "cleaned_length_chars": len(cleaned_text),
-                "original_word_count": len(large_document.split()),
-                "cleaned_word_count": len(cleaned_text.split()),
+                "original_word_count": LARGE_TEST_DOCUMENT_WORDS,
+                "cleaned_word_count": cleaned_word_count,
                 "summary_length_words": len(summary.split()),
                 "processing_times": {
                     "text_cleaning_seconds": round(cleaning_time, 2),
@@ -902,7 +1127,7 @@ async def test_large_document_processing():
                     "total_processing_seconds": round(total_time, 2)
                 },
                 "summary_valid": summary_valid,
-                "summary_preview": summary[:200] + "..." if len(summary) > 200 else summary,
+                "summary_preview": _preview(summary, 200),
                 "performance_assessment": {
                     "fast_cleaning": cleaning_time < 5,
                     "reasonable_summarization": summary_time < 120,  # 2 minutes
@@ -911,37 +1136,44 @@ async def test_large_document_processing():
                 "recommendations": [
                     "Processing completed successfully" if summary_valid else "Summary generation failed",
                     f"Total time: {round(total_time, 1)}s - {'Acceptable' if total_time < 180 else 'Too slow'}",
-                    "Frontend should receive this response without timeout"
-                ],
-                "timestamp": time.time()
-            }
+                    "Frontend receives each stage as it finishes, so the connection stays active"
+                ]
+            })
             
-        except Exception as summary_error:
-            return {
+        except Exception as e:
+            logger.error(f"Large document processing test failed: {str(e)}")
+            yield ndjson({
+                "stage": "error",
                 "status": "error",
-                "error": str(summary_error),
-                "processing_time_before_error": round(time.time() - start_time, 2),
-                "issue": "Summarization failed - this explains why frontend gets no response",
-                "timestamp": time.time()
-            }
-        
-    except Exception as e:
-        logger.error(f"Large document processing test failed: {str(e)}")
-        return {
-            "status": "error",
-            "error": str(e),
-            "timestamp": time.time()
-        }
+                "error": str(e)
+            })
+    
+    return StreamingResponse(stages(), media_type="application/x-ndjson")
+
+# Readiness probes arrive about once a second per replica; answer them from a short-lived snapshot
+READINESS_TTL = 1  # seconds
+_readiness_cache = {"time": float("-inf"), "payload": None}
+
+# Imported modules stay imported, so the dependency check only needs to run once
+try:
+    import transformers, fastapi
+    CRITICAL_DEPENDENCIES_AVAILABLE = True
+except ImportError:
+    CRITICAL_DEPENDENCIES_AVAILABLE = False
 
 @router.get("/health/ready")
-async def readiness_check():
+def readiness_check():
     """Kubernetes-style readiness probe"""
+    now = time.monotonic()
+    if now - _readiness_cache["time"] < READINESS_TTL:
+        return _readiness_cache["payload"]
+    
     try:
         # Check if critical services are ready
         checks = {
             "model_manager": False,
             "memory_available": False,
-            "dependencies": False
+            "dependencies": CRITICAL_DEPENDENCIES_AVAILABLE
         }
         
         # Check model manager
@@ -952,27 +1184,25 @@ async def readiness_check():
             pass
         
         # Check memory
-        memory = psutil.virtual_memory()
-        checks["memory_available"] = memory.percent < 90
-        
-        # Check critical dependencies
-        try:
-            import torch, transformers, fastapi
-            checks["dependencies"] = True
-        except:
-            pass
+        checks["memory_available"] = _memory_percent_used() < 90
         
         all_ready = all(checks.values())
         
-        return {
+        payload = {
             "ready": all_ready,
             "checks": checks,
             "timestamp": time.time()
         }
     except Exception as e:
         logger.error(f"Readiness check failed: {str(e)}")
-        return {
+        payload = {
             "ready": False,
             "error": str(e),
             "timestamp": time.time()
         }
+    
+    _readiness_cache.update(time=now, payload=payload)
+    return payload
+
+if get_settings().ENABLE_TEST_ROUTES:
+    router.include_router(test_router)
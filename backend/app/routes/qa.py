@@ -4,16 +4,304 @@ Handles interactive question-answering functionality
 """
 
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, NamedTuple, Tuple
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import hashlib
 import logging
+import math
+import os
+import re
+import threading
 
 from app.services.analysis import analysis_service
 from app.services.models import model_manager
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Inference is compute-bound, so more workers than cores only adds contention
+_qa_executor = ThreadPoolExecutor(
+    max_workers=os.cpu_count() or 1,
+    thread_name_prefix="qa"
+)
+
+async def _run_blocking(func, *args):
+    """Run a blocking callable in the Q&A thread pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_qa_executor, func, *args)
+
+# Q&A pipelines resolved once at startup; None until bound (or if loading failed)
+_EN_QA = None
+_ML_QA = None
+
+@router.on_event("startup")
+async def bind_qa_models():
+    """Resolve the Q&A pipelines up front so requests skip the manager lookup"""
+    global _EN_QA, _ML_QA
+    try:
+        _EN_QA = await _run_blocking(model_manager.get_qa_model)
+        _ML_QA = await _run_blocking(model_manager.get_multilingual_qa_model)
+    except Exception as e:
+        logger.warning(f"Q&A models not preloaded, loading on first request: {str(e)}")
+
+def _resolve_qa_model(language: str):
+    qa_model = _EN_QA if language == "en" else _ML_QA
+    if qa_model is None:
+        qa_model = model_manager.get_qa_model() if language == "en" else model_manager.get_multilingual_qa_model()
+    return qa_model
+
+# Answers keyed by (question, context, language) so repeated questions skip the model
+QA_CACHE_SIZE = 10_000
+_qa_cache = OrderedDict()
+_qa_cache_lock = threading.Lock()
+
+def _digest(text: str) -> str:
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+def _normalize_question(question: str) -> str:
+    # Whitespace variants of a question share one answer; case is kept because the QA models are cased
+    return " ".join(question.split())
+
+def _qa_cache_key(question: str, context_digest: str, language: str) -> tuple:
+    return (_digest(_normalize_question(question)), context_digest, language)
+
+def _cache_lookup(key: tuple) -> Optional[Dict[str, Any]]:
+    with _qa_cache_lock:
+        if key in _qa_cache:
+            _qa_cache.move_to_end(key)
+            return _qa_cache[key]
+    return None
+
+def _cache_store(key: tuple, result: Dict[str, Any]):
+    with _qa_cache_lock:
+        _qa_cache[key] = result
+        while len(_qa_cache) > QA_CACHE_SIZE:
+            _qa_cache.popitem(last=False)
+
+def _answer_cached(qa_model, question: str, context: str, language: str) -> Dict[str, Any]:
+    """Run the Q&A model, reusing the answer for a previously seen question and context"""
+    key = _qa_cache_key(question, _digest(context), language)
+    result = _cache_lookup(key)
+    if result is None:
+        result = qa_model(question=question, context=context)
+        _cache_store(key, result)
+    return result
+
+def _answer_batch_cached(qa_model, questions: List[str], context: str, language: str) -> List[Dict[str, Any]]:
+    """Answer questions on a shared context, sending the uncached ones through the model as one batch"""
+    context_digest = _digest(context)
+    keys = [_qa_cache_key(question, context_digest, language) for question in questions]
+    results = [_cache_lookup(key) for key in keys]
+    
+    # Repeated questions within the request share one encoder pass
+    pending = {}
+    for i, result in enumerate(results):
+        if result is None:
+            pending.setdefault(keys[i], i)
+    if pending:
+        inputs = [{"question": questions[i], "context": context} for i in pending.values()]
+        answers = qa_model(inputs, batch_size=min(len(inputs), 16))
+        # The pipeline unwraps single-item batches
+        if isinstance(answers, dict):
+            answers = [answers]
+        answered = dict(zip(pending, answers))
+        for key, answer in answered.items():
+            _cache_store(key, answer)
+        results = [result if result is not None else answered[key] for key, result in zip(keys, results)]
+    return results
+
+# Keyword triggers for rule-based suggested questions, checked in this order
+QUESTION_TRIGGERS = (
+    (frozenset({'when', 'date', 'year', 'time'}), "When did this happen?"),
+    (frozenset({'where', 'location', 'place'}), "Where does this take place?"),
+    (frozenset({'who', 'person', 'people', 'author'}), "Who are the key people involved?"),
+    (frozenset({'how', 'method', 'process', 'way'}), "How does this process work?"),
+    (frozenset({'why', 'reason', 'because', 'cause'}), "Why is this significant?"),
+)
+GENERIC_QUESTIONS = (
+    "What is the main idea?",
+    "What are the key takeaways?",
+    "What details are most important?"
+)
+
+def _keyword_trie_pattern(keywords) -> str:
+    """Regex alternation with shared prefixes factored out, so matching walks a keyword trie"""
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}  # end of keyword
+    
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        optional = "" in node
+        if len(branches) == 1 and not optional:
+            return branches[0]
+        return "(?:" + "|".join(branches) + ")" + ("?" if optional else "")
+    
+    return build(trie)
+
+# One scan over the context finds every trigger keyword, stopping once all categories have matched
+_TRIGGER_CATEGORY = {
+    keyword: i for i, (keywords, _) in enumerate(QUESTION_TRIGGERS) for keyword in keywords
+}
+_TRIGGER_PATTERN = re.compile(r"(?<![a-z])(" + _keyword_trie_pattern(_TRIGGER_CATEGORY) + r")(?![a-z])")
+
+def _matched_triggers(text: str) -> set:
+    """Indexes into QUESTION_TRIGGERS whose keywords occur as words in lowercased text"""
+    matched = set()
+    for match in _TRIGGER_PATTERN.finditer(text):
+        matched.add(_TRIGGER_CATEGORY[match.group(1)])
+        if len(matched) == len(QUESTION_TRIGGERS):
+            break
+    return matched
+
+SUGGESTION_CACHE_SIZE = 512
+_suggestion_cache = OrderedDict()
+
+def _suggest_questions(context: str) -> tuple:
+    """Rule-based suggestions and word count for a context, memoized by context digest"""
+    key = _digest(context)
+    if key in _suggestion_cache:
+        _suggestion_cache.move_to_end(key)
+        return _suggestion_cache[key]
+    
+    # Simple rule-based question generation
+    # In a production system, you might use a more sophisticated model
+    matched = _matched_triggers(context.lower())
+    suggested_questions = [question for i, (_, question) in enumerate(QUESTION_TRIGGERS) if i in matched]
+    suggested_questions.extend(GENERIC_QUESTIONS)
+    
+    # Remove duplicates
+    result = (tuple(dict.fromkeys(suggested_questions)), len(context.split()))
+    _suggestion_cache[key] = result
+    while len(_suggestion_cache) > SUGGESTION_CACHE_SIZE:
+        _suggestion_cache.popitem(last=False)
+    return result
+
+# Long contexts are narrowed to the sentences that best match the question (BM25)
+MAX_CONTEXT_LENGTH = 2000  # characters, roughly 400-500 tokens
+SELECTED_CONTEXT_LENGTH = 1800
+SELECTED_SENTENCES = 8
+BM25_K1 = 1.5
+BM25_B = 0.75
+SENTENCE_INDEX_CACHE_SIZE = 32
+_SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+')
+_TOKEN = re.compile(r"\w+")
+
+class SentenceIndex(NamedTuple):
+    sentences: Tuple[str, ...]
+    offsets: Tuple[int, ...]  # start of each sentence in the original context
+    postings: Dict[str, List[Tuple[int, int]]]  # term -> [(sentence, term frequency)]
+    lengths: Tuple[int, ...]
+    avg_length: float
+
+_sentence_index_cache = OrderedDict()
+_sentence_index_lock = threading.Lock()
+
+def _split_sentences(context: str):
+    """Yield (offset, sentence) pairs, with offsets into the original context"""
+    start = 0
+    for boundary in _SENTENCE_SPLIT.finditer(context):
+        yield from _stripped_span(context, start, boundary.start())
+        start = boundary.end()
+    yield from _stripped_span(context, start, len(context))
+
+def _stripped_span(context: str, start: int, end: int):
+    segment = context[start:end]
+    sentence = segment.strip()
+    if sentence:
+        yield start + len(segment) - len(segment.lstrip()), sentence
+
+def _build_sentence_index(context: str) -> SentenceIndex:
+    spans = tuple(_split_sentences(context))
+    offsets = tuple(offset for offset, _ in spans)
+    sentences = tuple(sentence for _, sentence in spans)
+    postings = {}
+    lengths = []
+    for i, sentence in enumerate(sentences):
+        counts = Counter(_TOKEN.findall(sentence.lower()))
+        lengths.append(sum(counts.values()))
+        for term, tf in counts.items():
+            postings.setdefault(term, []).append((i, tf))
+    avg_length = sum(lengths) / len(lengths) if lengths else 0.0
+    return SentenceIndex(sentences, offsets, postings, tuple(lengths), avg_length)
+
+def _sentence_index(context: str) -> SentenceIndex:
+    """Sentence index for a context, reused across questions on the same document"""
+    key = _digest(context)
+    with _sentence_index_lock:
+        if key in _sentence_index_cache:
+            _sentence_index_cache.move_to_end(key)
+            return _sentence_index_cache[key]
+    
+    index = _build_sentence_index(context)
+    
+    with _sentence_index_lock:
+        _sentence_index_cache[key] = index
+        while len(_sentence_index_cache) > SENTENCE_INDEX_CACHE_SIZE:
+            _sentence_index_cache.popitem(last=False)
+    return index
+
+class SelectedContext(NamedTuple):
+    text: str
+    spans: Tuple[Tuple[int, int], ...]  # (start in text, start in original context) per sentence; empty if text is a prefix
+
+    def to_original(self, position: int) -> int:
+        """Map a character offset in the selected text back to the original context"""
+        for text_start, original_start in reversed(self.spans):
+            if position >= text_start:
+                return original_start + position - text_start
+        return position
+
+def _select_context(question: str, context: str) -> SelectedContext:
+    """Return short contexts as-is, otherwise the top-scoring sentences in document order"""
+    if len(context) <= MAX_CONTEXT_LENGTH:
+        return SelectedContext(context, ())
+    
+    index = _sentence_index(context)
+    total = len(index.sentences)
+    scores = {}
+    for term in set(_TOKEN.findall(question.lower())):
+        postings = index.postings.get(term)
+        if not postings:
+            continue
+        idf = math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+        for i, tf in postings:
+            norm = tf + BM25_K1 * (1 - BM25_B + BM25_B * index.lengths[i] / index.avg_length)
+            scores[i] = scores.get(i, 0.0) + idf * tf * (BM25_K1 + 1) / norm
+    
+    chosen = []
+    used = 0
+    for i in sorted(scores, key=scores.get, reverse=True)[:SELECTED_SENTENCES]:
+        length = len(index.sentences[i]) + 1
+        if used + length <= SELECTED_CONTEXT_LENGTH:
+            chosen.append(i)
+            used += length
+    
+    # Nothing matched (or only oversized sentences did): fall back to the leading text
+    if not chosen:
+        return SelectedContext(context[:MAX_CONTEXT_LENGTH], ())
+    
+    parts = []
+    spans = []
+    position = 0
+    for i in sorted(chosen):
+        spans.append((position, index.offsets[i]))
+        parts.append(index.sentences[i])
+        position += len(index.sentences[i]) + 1
+    return SelectedContext(" ".join(parts), tuple(spans))
+
+CURRENT_CONTEXT_HEADER = "\n\nCurrent context:\n"
+CURRENT_CONTEXT_HEADER_WORDS = len(CURRENT_CONTEXT_HEADER.split())
 
 # Pydantic models
 class QARequest(BaseModel):
@@ -48,25 +336,22 @@ async def ask_question(request: QARequest):
             raise HTTPException(status_code=400, detail="Context cannot be empty")
         
         # Choose appropriate model based on language
-        if request.language == "en":
-            qa_model = model_manager.get_qa_model()
-        else:
-            qa_model = model_manager.get_multilingual_qa_model()
+        qa_model = await _run_blocking(_resolve_qa_model, request.language)
         
-        # Truncate context if too long (model limit is usually 512 tokens)
-        max_context_length = 2000  # characters, roughly 400-500 tokens
-        context = request.context[:max_context_length] if len(request.context) > max_context_length else request.context
+        # Narrow long contexts to the relevant sentences (model limit is usually 512 tokens)
+        selected = await _run_blocking(_select_context, request.question, request.context)
         
         # Get answer from model
-        result = qa_model(
-            question=request.question,
-            context=context
-        )
+        result = await _run_blocking(_answer_cached, qa_model, request.question, selected.text, request.language)
+        
+        # Positions are reported against the caller's context, not the selected sentences
+        answer_start = selected.to_original(result['start'])
+        answer_end = selected.to_original(result['end'])
         
         # Extract supporting text (context around the answer)
-        start_pos = max(0, result['start'] - 100)
-        end_pos = min(len(context), result['end'] + 100)
-        supporting_text = context[start_pos:end_pos]
+        start_pos = max(0, answer_start - 100)
+        end_pos = min(len(request.context), answer_end + 100)
+        supporting_text = request.context[start_pos:end_pos]
         
         # Calculate metadata
         metadata = {
@@ -77,11 +362,12 @@ async def ask_question(request: QARequest):
             'model_used': 'roberta-base-squad2' if request.language == 'en' else 'xlm-roberta-large-mlqa'
         }
         
-        return QAResponse(
+        # Values come from the pipeline output; FastAPI still validates against response_model on the way out
+        return QAResponse.model_construct(
             answer=result['answer'],
             confidence=round(result['score'], 4),
-            start_position=result['start'],
-            end_position=result['end'],
+            start_position=answer_start,
+            end_position=answer_end,
             supporting_text=supporting_text,
             metadata=metadata
         )
@@ -106,27 +392,26 @@ async def conversational_qa(request: ConversationQARequest):
         
         # Build enhanced context with conversation history
         enhanced_context = request.context
+        context_words = len(request.context.split())
+        enhanced_context_words = context_words
         
         if request.conversation_history:
             # Add previous Q&A pairs to context for better understanding
-            history_text = "\n\nPrevious conversation:\n"
+            history_parts = ["\n\nPrevious conversation:\n"]
             for qa_pair in request.conversation_history[-3:]:  # Last 3 exchanges
                 if 'question' in qa_pair and 'answer' in qa_pair:
-                    history_text += f"Q: {qa_pair['question']}\nA: {qa_pair['answer']}\n"
+                    history_parts.append(f"Q: {qa_pair['question']}\nA: {qa_pair['answer']}\n")
+            history_text = "".join(history_parts)
             
-            enhanced_context = history_text + "\n\nCurrent context:\n" + request.context
+            enhanced_context = history_text + CURRENT_CONTEXT_HEADER + request.context
+            # Parts are joined on whitespace, so their word counts add up exactly
+            enhanced_context_words += len(history_text.split()) + CURRENT_CONTEXT_HEADER_WORDS
         
-        # Choose appropriate model
-        if request.language == "en":
-            qa_model = model_manager.get_qa_model()
-        else:
-            qa_model = model_manager.get_multilingual_qa_model()
+        # Choose appropriate model based on language
+        qa_model = await _run_blocking(_resolve_qa_model, request.language)
         
         # Get answer
-        result = qa_model(
-            question=request.question,
-            context=enhanced_context
-        )
+        result = await _run_blocking(_answer_cached, qa_model, request.question, enhanced_context, request.language)
         
         # Extract supporting text
         start_pos = max(0, result['start'] - 100)
@@ -136,15 +421,15 @@ async def conversational_qa(request: ConversationQARequest):
         # Calculate metadata
         metadata = {
             'question_length': len(request.question.split()),
-            'context_length': len(request.context.split()),
-            'enhanced_context_length': len(enhanced_context.split()),
+            'context_length': context_words,
+            'enhanced_context_length': enhanced_context_words,
             'answer_length': len(result['answer'].split()),
             'conversation_turns': len(request.conversation_history),
             'language': request.language,
             'model_used': 'roberta-base-squad2' if request.language == 'en' else 'xlm-roberta-large-mlqa'
         }
         
-        return QAResponse(
+        return QAResponse.model_construct(
             answer=result['answer'],
             confidence=round(result['score'], 4),
             start_position=result['start'],
@@ -171,24 +456,32 @@ async def batch_qa(questions: List[str], context: str, language: str = "en"):
         if not context.strip():
             raise HTTPException(status_code=400, detail="Context cannot be empty")
         
-        # Choose appropriate model
-        if language == "en":
-            qa_model = model_manager.get_qa_model()
-        else:
-            qa_model = model_manager.get_multilingual_qa_model()
+        # Choose appropriate model based on language
+        qa_model = await _run_blocking(_resolve_qa_model, language)
+        
+        asked = [question for question in questions if question.strip()]
+        
+        try:
+            answers = await _run_blocking(_answer_batch_cached, qa_model, asked, context, language)
+        except Exception as e:
+            # Fall back to one call per question so a single bad input doesn't fail the rest
+            logger.warning(f"Batched Q&A failed, answering individually: {str(e)}")
+            answered = {}
+            for question in asked:
+                normalized = _normalize_question(question)
+                if normalized in answered:
+                    continue
+                try:
+                    answered[normalized] = await _run_blocking(_answer_cached, qa_model, question, context, language)
+                except Exception as e:
+                    logger.warning(f"Failed to answer question '{question}': {str(e)}")
+                    answered[normalized] = None
+            answers = [answered[_normalize_question(question)] for question in asked]
         
         results = []
         
-        for question in questions:
-            if not question.strip():
-                continue
-                
+        for question, result in zip(asked, answers):
             try:
-                result = qa_model(
-                    question=question,
-                    context=context
-                )
-                
                 # Extract supporting text
                 start_pos = max(0, result['start'] - 50)
                 end_pos = min(len(context), result['end'] + 50)
@@ -232,56 +525,10 @@ async def get_suggested_questions(context: str, num_questions: int = 5):
         if not context.strip():
             raise HTTPException(status_code=400, detail="Context cannot be empty")
         
-        # Simple rule-based question generation
-        # In a production system, you might use a more sophisticated model
-        
-        suggested_questions = []
-        
-        # Extract key entities and concepts for question generation
-        words = context.lower().split()
-        
-        # Common question patterns
-        question_patterns = [
-            "What is the main topic discussed?",
-            "What are the key points mentioned?",
-            "Who are the main people or entities involved?",
-            "When did these events take place?",
-            "Where do these events occur?",
-            "Why is this important?",
-            "How does this work?",
-            "What are the implications?",
-            "What are the benefits mentioned?",
-            "What challenges are discussed?"
-        ]
-        
-        # Filter questions based on context content
-        if any(word in words for word in ['when', 'date', 'year', 'time']):
-            suggested_questions.append("When did this happen?")
-        
-        if any(word in words for word in ['where', 'location', 'place']):
-            suggested_questions.append("Where does this take place?")
-        
-        if any(word in words for word in ['who', 'person', 'people', 'author']):
-            suggested_questions.append("Who are the key people involved?")
-        
-        if any(word in words for word in ['how', 'method', 'process', 'way']):
-            suggested_questions.append("How does this process work?")
-        
-        if any(word in words for word in ['why', 'reason', 'because', 'cause']):
-            suggested_questions.append("Why is this significant?")
-        
-        # Add generic questions
-        suggested_questions.extend([
-            "What is the main idea?",
-            "What are the key takeaways?",
-            "What details are most important?"
-        ])
-        
-        # Remove duplicates and limit to requested number
-        unique_questions = list(dict.fromkeys(suggested_questions))
+        unique_questions, context_length = _suggest_questions(context)
         return {
-            'suggested_questions': unique_questions[:num_questions],
-            'context_length': len(context.split()),
+            'suggested_questions': list(unique_questions[:num_questions]),
+            'context_length': context_length,
             'total_suggestions': len(unique_questions)
         }
         
@@ -4,8 +4,11 @@ Handles all summarization endpoints with modular service architecture
 """
 
 from fastapi import APIRouter, HTTPException, UploadFile, File, Form
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, HttpUrl
 from typing import List, Optional, Dict, Any
+import aiofiles
+import asyncio
 import logging
 import tempfile
 import os
@@ -17,9 +20,10 @@ from app.services.content_extractor import content_extractor
 from app.services.speech_to_text import speech_to_text
 from app.services.summarizer import summarizer
 from app.services.analysis import analysis_service
+from app.services.models import model_manager
 
 logger = logging.getLogger(__name__)
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
 # ============ REQUEST/RESPONSE MODELS ============
 
@@ -54,6 +58,79 @@ class SummaryResponse(BaseModel):
     sentiment: Dict[str, Any]
     metadata: Dict[str, Any]
 
+# ============ HELPERS ============
+
+def _summary_response(summary: str, analysis: Dict[str, Any], metadata: Dict[str, Any]) -> ORJSONResponse:
+    """Serialize a SummaryResponse-shaped payload with orjson"""
+    # Returning a Response skips FastAPI's re-validation against response_model, which stays for the OpenAPI schema
+    return ORJSONResponse({
+        'summary': summary,
+        'keywords': analysis['keywords'],
+        'topics': analysis['topics'],
+        'sentiment': analysis['sentiment'],
+        'metadata': metadata
+    })
+
+async def _analysis_with_fallback(text: str) -> Dict[str, Any]:
+    """Full analysis, degrading to empty results instead of failing the summary"""
+    try:
+        return await analysis_service.full_analysis(text)
+    except Exception as analysis_error:
+        logger.warning(f"Analysis failed, using fallback: {analysis_error}")
+        # Fallback analysis if full analysis fails
+        return {
+            'keywords': [],
+            'topics': [],
+            'sentiment': {'label': 'neutral', 'score': 0.0}
+        }
+
+# Bounds concurrent extractions across requests (temp files and CPU-heavy parsing)
+MAX_CONCURRENT_EXTRACTIONS = 4
+_extraction_slots = asyncio.Semaphore(MAX_CONCURRENT_EXTRACTIONS)
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+def _extract_blocking(file_path: str, file_type: str) -> Dict[str, Any]:
+    # The PDF/DOCX extractors are coroutines with synchronous bodies, so give each its own loop in a worker thread
+    return asyncio.run(text_extractor.extract(file_path, file_type))
+
+async def _extract_upload(file: UploadFile) -> str:
+    """Save an upload to a temp file and return its extracted text"""
+    file_extension = Path(file.filename).suffix.lower()
+    async with _extraction_slots:
+        # Save temporarily, streaming in chunks so the upload is never held in memory whole
+        with tempfile.NamedTemporaryFile(delete=False, suffix=file_extension) as temp_file:
+            temp_file_path = temp_file.name
+        
+        try:
+            async with aiofiles.open(temp_file_path, 'wb') as out:
+                while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                    await out.write(chunk)
+            
+            # Extract text
+            extraction_result = await asyncio.to_thread(_extract_blocking, temp_file_path, file_extension[1:])
+            return extraction_result['text']
+        finally:
+            os.unlink(temp_file_path)
+
+@router.on_event("startup")
+async def warm_analysis_models():
+    """Load the analysis models in parallel at startup so the first request skips the load"""
+    results = await asyncio.gather(
+        asyncio.to_thread(model_manager.get_keybert_model),
+        asyncio.to_thread(model_manager.get_bertopic_model),
+        asyncio.to_thread(model_manager.get_sentiment_model),
+        return_exceptions=True
+    )
+    for result in results:
+        if isinstance(result, Exception):
+            logger.warning(f"Analysis model not preloaded, loading on first request: {str(result)}")
+    
+    # One tiny forward pass so kernel setup is not paid by the first request either
+    try:
+        await asyncio.to_thread(model_manager.get_sentiment_model(), "ok")
+    except Exception as e:
+        logger.warning(f"Sentiment warmup failed: {str(e)}")
+
 # ============ ENDPOINTS ============
 
 @router.post("/summarize/text", response_model=SummaryResponse)
@@ -65,34 +142,33 @@ async def summarize_text_endpoint(request: TextSummarizeRequest):
         if not request.text or len(request.text.strip()) < 10:
             raise HTTPException(status_code=400, detail="Text is too short or empty")
         
-        # Generate summary
-        summary = summarizer.summarize_text(
-            request.text,
-            summary_style=request.summary_style,
-            custom_prompt=request.custom_prompt
+        # Generate summary while the analysis (KeyBERT, BERTopic, Sentiment) runs on the same text
+        summary, analysis = await asyncio.gather(
+            asyncio.to_thread(
+                summarizer.summarize_text,
+                request.text,
+                summary_style=request.summary_style,
+                custom_prompt=request.custom_prompt
+            ),
+            analysis_service.full_analysis(request.text)
         )
         
-        # Step 3: Analysis (KeyBERT, BERTopic, Sentiment)
-        analysis = analysis_service.full_analysis(request.text)
-        
         # Step 4: Metadata
+        original_word_count = len(request.text.split())
+        summary_word_count = len(summary.split())
         metadata = {
-            'original_word_count': len(request.text.split()),
-            'summary_word_count': len(summary.split()),
-            'compression_ratio': summarizer.calculate_compression_ratio(request.text, summary),
-            'reading_time_minutes': summarizer.calculate_reading_time(summary),
+            'original_word_count': original_word_count,
+            'summary_word_count': summary_word_count,
+            'compression_ratio': summarizer.calculate_compression_ratio(
+                request.text, summary, original_word_count, summary_word_count
+            ),
+            'reading_time_minutes': summarizer.calculate_reading_time(summary, word_count=summary_word_count),
             'content_type': 'text',
             'summary_style': request.summary_style,
             'custom_prompt_used': bool(request.custom_prompt)
         }
         
-        return SummaryResponse(
-            summary=summary,
-            keywords=analysis['keywords'],
-            topics=analysis['topics'],
-            sentiment=analysis['sentiment'],
-            metadata=metadata
-        )
+        return _summary_response(summary, analysis, metadata)
         
     except HTTPException:
         raise
@@ -114,83 +190,68 @@ async def summarize_document_endpoint(
             raise HTTPException(status_code=400, detail="No files provided")
         
         # Step 1: Text Extraction & Structure
-        combined_text = ""
-        processed_files = []
+        named_files = [file for file in files if file.filename]
         
-        for file in files:
-            if not file.filename:
-                continue
-            
+        # Reject unsupported types before doing any extraction work
+        for file in named_files:
             file_extension = Path(file.filename).suffix.lower()
             if file_extension not in text_extractor.supported_formats:
                 raise HTTPException(
                     status_code=400,
                     detail=f"Unsupported file type: {file_extension}"
                 )
-            
-            # Save temporarily
-            with tempfile.NamedTemporaryFile(delete=False, suffix=file_extension) as temp_file:
-                content = await file.read()
-                temp_file.write(content)
-                temp_file_path = temp_file.name
-            
-            try:
-                # Extract text
-                file_type = file_extension[1:]
-                extraction_result = await text_extractor.extract(temp_file_path, file_type)
-                
-                if extraction_result['text'].strip():
-                    combined_text += f"\n\n{extraction_result['text']}"
-                    processed_files.append(file.filename)
-            finally:
-                os.unlink(temp_file_path)
+        
+        # Files are extracted concurrently; results are combined in upload order
+        results = await asyncio.gather(
+            *(_extract_upload(file) for file in named_files),
+            return_exceptions=True
+        )
+        
+        combined_text = ""
+        processed_files = []
+        for file, result in zip(named_files, results):
+            if isinstance(result, Exception):
+                raise result
+            if result.strip():
+                combined_text += f"\n\n{result}"
+                processed_files.append(file.filename)
         
         if not combined_text.strip():
             raise HTTPException(status_code=400, detail="No text extracted from files")
         
-        if len(combined_text.split()) < 10:
+        original_word_count = len(combined_text.split())
+        if original_word_count < 10:
             raise HTTPException(status_code=400, detail="Extracted text too short")
         
-        # Step 2: Summarization
-        summary = summarizer.summarize_document(
-            combined_text,
-            summary_style=summary_style
-        )
-        
-        # Step 3: Analysis (optimized for large documents)
+        # Steps 2-3: Summarization and analysis (optimized for large documents) run concurrently
         # For large documents, limit analysis to prevent timeouts
         analysis_text = combined_text[:5000] if len(combined_text) > 5000 else combined_text
         logger.info(f"Running analysis on {len(analysis_text)} characters (truncated from {len(combined_text)})")
         
-        try:
-            analysis = analysis_service.full_analysis(analysis_text)
-        except Exception as analysis_error:
-            logger.warning(f"Analysis failed, using fallback: {analysis_error}")
-            # Fallback analysis if full analysis fails
-            analysis = {
-                'keywords': [],
-                'topics': [],
-                'sentiment': {'label': 'neutral', 'score': 0.0}
-            }
+        summary, analysis = await asyncio.gather(
+            asyncio.to_thread(
+                summarizer.summarize_document,
+                combined_text,
+                summary_style=summary_style
+            ),
+            _analysis_with_fallback(analysis_text)
+        )
         
         # Step 4: Metadata
+        summary_word_count = len(summary.split())
         metadata = {
-            'original_word_count': len(combined_text.split()),
-            'summary_word_count': len(summary.split()),
-            'compression_ratio': summarizer.calculate_compression_ratio(combined_text, summary),
-            'reading_time_minutes': summarizer.calculate_reading_time(summary),
+            'original_word_count': original_word_count,
+            'summary_word_count': summary_word_count,
+            'compression_ratio': summarizer.calculate_compression_ratio(
+                combined_text, summary, original_word_count, summary_word_count
+            ),
+            'reading_time_minutes': summarizer.calculate_reading_time(summary, word_count=summary_word_count),
             'content_type': 'document',
             'summary_style': summary_style,
             'files_processed': processed_files
         }
         
-        return SummaryResponse(
-            summary=summary,
-            keywords=analysis['keywords'],
-            topics=analysis['topics'],
-            sentiment=analysis['sentiment'],
-            metadata=metadata
-        )
+        return _summary_response(summary, analysis, metadata)
         
     except HTTPException:
         raise
@@ -210,37 +271,35 @@ async def summarize_url_endpoint(request: URLSummarizeRequest):
         if not url_content['content'].strip():
             raise HTTPException(status_code=400, detail="No content extracted from URL")
         
-        if len(url_content['content'].split()) < 10:
+        if url_content['word_count'] < 10:
             raise HTTPException(status_code=400, detail="URL content too short")
         
-        # Step 2: Summarization
-        summary_text = summarizer.summarize_url(
-            url_content['content'],
-            summary_style=request.summary_style
+        # Steps 2-3: Summarization and analysis run concurrently on the same content
+        summary_text, analysis = await asyncio.gather(
+            asyncio.to_thread(
+                summarizer.summarize_url,
+                url_content['content'],
+                summary_style=request.summary_style
+            ),
+            analysis_service.full_analysis(url_content['content'])
         )
         
-        # Step 3: Analysis
-        analysis = analysis_service.full_analysis(url_content['content'])
-        
         # Step 4: Metadata
+        summary_word_count = len(summary_text.split())
         metadata = {
             'original_word_count': url_content['word_count'],
-            'summary_word_count': len(summary_text.split()),
-            'compression_ratio': summarizer.calculate_compression_ratio(url_content['content'], summary_text),
-            'reading_time_minutes': summarizer.calculate_reading_time(summary_text),
+            'summary_word_count': summary_word_count,
+            'compression_ratio': summarizer.calculate_compression_ratio(
+                url_content['content'], summary_text, url_content['word_count'], summary_word_count
+            ),
+            'reading_time_minutes': summarizer.calculate_reading_time(summary_text, word_count=summary_word_count),
             'content_type': 'url',
             'summary_style': request.summary_style,
             'source_url': str(request.url),
             'source_title': url_content['title']
         }
         
-        return SummaryResponse(
-            summary=summary_text,
-            keywords=analysis['keywords'],
-            topics=analysis['topics'],
-            sentiment=analysis['sentiment'],
-            metadata=metadata
-        )
+        return _summary_response(summary_text, analysis, metadata)
         
     except HTTPException:
         raise
@@ -264,24 +323,28 @@ async def summarize_youtube_endpoint(request: YoutubeSummarizeRequest):
         if not youtube_content['transcript'].strip():
             raise HTTPException(status_code=400, detail="No transcript available")
         
-        if len(youtube_content['transcript'].split()) < 10:
+        if youtube_content['word_count'] < 10:
             raise HTTPException(status_code=400, detail="Transcript too short")
         
-        # Step 2: Summarization
-        summary_text = summarizer.summarize_youtube(
-            youtube_content['transcript'],
-            summary_style=request.summary_style
+        # Steps 2-3: Summarization and analysis run concurrently on the same transcript
+        summary_text, analysis = await asyncio.gather(
+            asyncio.to_thread(
+                summarizer.summarize_youtube,
+                youtube_content['transcript'],
+                summary_style=request.summary_style
+            ),
+            analysis_service.full_analysis(youtube_content['transcript'])
         )
         
-        # Step 3: Analysis
-        analysis = analysis_service.full_analysis(youtube_content['transcript'])
-        
         # Step 4: Metadata
+        summary_word_count = len(summary_text.split())
         metadata = {
             'original_word_count': youtube_content['word_count'],
-            'summary_word_count': len(summary_text.split()),
-            'compression_ratio': summarizer.calculate_compression_ratio(youtube_content['transcript'], summary_text),
-            'reading_time_minutes': summarizer.calculate_reading_time(summary_text),
+            'summary_word_count': summary_word_count,
+            'compression_ratio': summarizer.calculate_compression_ratio(
+                youtube_content['transcript'], summary_text, youtube_content['word_count'], summary_word_count
+            ),
+            'reading_time_minutes': summarizer.calculate_reading_time(summary_text, word_count=summary_word_count),
             'content_type': 'youtube',
             'summary_style': request.summary_style,
             'video_title': youtube_content['title'],
@@ -290,13 +353,7 @@ async def summarize_youtube_endpoint(request: YoutubeSummarizeRequest):
             'source_url': str(request.url)
         }
         
-        return SummaryResponse(
-            summary=summary_text,
-            keywords=analysis['keywords'],
-            topics=analysis['topics'],
-            sentiment=analysis['sentiment'],
-            metadata=metadata
-        )
+        return _summary_response(summary_text, analysis, metadata)
         
     except HTTPException:
         raise
@@ -316,32 +373,30 @@ async def summarize_multilingual_endpoint(request: TextSummarizeRequest):
         # Step 1: Preprocessing
         preprocessed = tokenizer_service.preprocess_text(request.text)
         
-        # Step 2: Summarization
-        summary_text = summarizer.summarize_multilingual(
-            preprocessed['text'],
-            summary_style=request.summary_style
+        # Steps 2-3: Summarization and analysis run concurrently on the same text
+        summary_text, analysis = await asyncio.gather(
+            asyncio.to_thread(
+                summarizer.summarize_multilingual,
+                preprocessed['text'],
+                summary_style=request.summary_style
+            ),
+            analysis_service.full_analysis(preprocessed['text'])
         )
         
-        # Step 3: Analysis
-        analysis = analysis_service.full_analysis(preprocessed['text'])
-        
         # Step 4: Metadata
+        summary_word_count = len(summary_text.split())
         metadata = {
             'original_word_count': preprocessed['word_count'],
-            'summary_word_count': len(summary_text.split()),
-            'compression_ratio': summarizer.calculate_compression_ratio(preprocessed['text'], summary_text),
-            'reading_time_minutes': summarizer.calculate_reading_time(summary_text),
+            'summary_word_count': summary_word_count,
+            'compression_ratio': summarizer.calculate_compression_ratio(
+                preprocessed['text'], summary_text, preprocessed['word_count'], summary_word_count
+            ),
+            'reading_time_minutes': summarizer.calculate_reading_time(summary_text, word_count=summary_word_count),
             'content_type': 'multilingual_text',
             'summary_style': request.summary_style
         }
         
-        return SummaryResponse(
-            summary=summary_text,
-            keywords=analysis['keywords'],
-            topics=analysis['topics'],
-            sentiment=analysis['sentiment'],
-            metadata=metadata
-        )
+        return _summary_response(summary_text, analysis, metadata)
         
     except HTTPException:
         raise
@@ -4,27 +4,115 @@ Handles KeyBERT keyword extraction, BERTopic topic modeling,
 Sentiment Analysis, and Q&A functionality
 """
 
+import asyncio
+import hashlib
 import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional
 from .models import model_manager
+from app.config.settings import get_settings
 
 logger = logging.getLogger(__name__)
 
+_SENTENCE_BOUNDARY = re.compile(r'[.!?]+')
+
+# Every analysis stage reads at most the first ANALYSIS_SAMPLE_CHARS, so that prefix fully determines the result
+ANALYSIS_SAMPLE_CHARS = 5000
+ANALYSIS_CACHE_SIZE = 1024
+
+# Sentiment requests arriving within this window share one batched forward pass
+SENTIMENT_BATCH_SIZE = 16
+SENTIMENT_BATCH_WINDOW = 0.015
+
+# Model inputs are cut by tokens, leaving room for special tokens within each model's window
+KEYWORD_MAX_TOKENS = 384
+SENTIMENT_MAX_TOKENS = 510
+QA_CONTEXT_MAX_TOKENS = 500
+# Upper bound on characters per token, so huge inputs are never tokenized in full
+MAX_CHARS_PER_TOKEN = 10
+
+def _truncate_to_tokens(tokenizer, text: str, max_tokens: int) -> str:
+    """Cut text to at most max_tokens tokens of the given tokenizer"""
+    # Never read past the analysis sample, which is what the full_analysis cache is keyed on
+    text = text[:min(max_tokens * MAX_CHARS_PER_TOKEN, ANALYSIS_SAMPLE_CHARS)]
+    # Cut the original string at the last kept token rather than decoding ids, which would
+    # lowercase (uncased vocabularies), respace punctuation and emit [UNK] for unknown characters
+    offsets = tokenizer(text, add_special_tokens=False, return_offsets_mapping=True)['offset_mapping']
+    if len(offsets) <= max_tokens:
+        return text
+    return text[:offsets[max_tokens - 1][1]]
+
 class AnalysisService:
     """Provides content analysis capabilities"""
     
-    def extract_keywords(self, text: str, top_k: int = 10) -> List[str]:
+    def __init__(self):
+        # One worker per analysis stage, shared across requests to bound the thread count
+        self._executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="analysis")
+        # The BERTopic instance is shared and refit per call, so a fit and its topic read must not interleave
+        self._bertopic_lock = threading.Lock()
+        # Recent full_analysis results: digest -> (stored_at, result)
+        self._cache = OrderedDict()
+        self._cache_ttl = get_settings().CACHE_TTL
+        # Sentiment micro-batcher, started lazily on the running loop
+        self._sentiment_queue = None
+        self._sentiment_worker_task = None
+    
+    def _split_sentences(self, text_sample: str) -> List[str]:
+        # Split text into sentences to provide multiple samples, dropping short fragments
+        sentences = _SENTENCE_BOUNDARY.split(text_sample)
+        return [s.strip() for s in sentences if len(s.strip()) > 20]
+    
+    def _encode(self, encoder, texts: List[str]):
+        """Embed texts in large batches; unit-normalized so cosine similarity reduces to a dot product"""
+        return encoder.encode(
+            texts,
+            batch_size=64,
+            show_progress_bar=False,
+            convert_to_numpy=True,
+            normalize_embeddings=True
+        )
+    
+    def _shared_embeddings(self, text: str) -> Optional[Dict[str, Any]]:
+        """Encode the analysis sample and its sentences in one batch for KeyBERT and BERTopic to share"""
+        try:
+            encoder = model_manager.get_sentence_encoder()
+            text_sample = text[:ANALYSIS_SAMPLE_CHARS]
+            sentences = self._split_sentences(text_sample)
+            keyword_sample = _truncate_to_tokens(encoder.tokenizer, text_sample, KEYWORD_MAX_TOKENS)
+            embeddings = self._encode(encoder, [keyword_sample] + sentences)
+            return {
+                'keyword_sample': keyword_sample,
+                'sentences': sentences,
+                'doc_embeddings': embeddings[:1],
+                'sentence_embeddings': embeddings[1:]
+            }
+        except Exception as e:
+            # Each stage can still embed on its own
+            logger.warning(f"Shared embedding failed: {str(e)}")
+            return None
+    
+    def extract_keywords(self, text: str, top_k: int = 10, shared: Optional[Dict[str, Any]] = None) -> List[str]:
         """Extract keywords using KeyBERT"""
         try:
             keybert = model_manager.get_keybert_model()
             
             # Limit text length for performance
-            text_sample = text[:5000] if len(text) > 5000 else text
+            if shared:
+                text_sample = shared['keyword_sample']
+            else:
+                text_sample = _truncate_to_tokens(
+                    model_manager.get_sentence_encoder().tokenizer, text[:ANALYSIS_SAMPLE_CHARS], KEYWORD_MAX_TOKENS
+                )
             
             keywords = keybert.extract_keywords(
                 text_sample,
                 keyphrase_ngram_range=(1, 2),
-                stop_words='english'
+                stop_words='english',
+                doc_embeddings=shared['doc_embeddings'] if shared else None
             )
             
             # Limit to top_k results
@@ -35,25 +123,28 @@ class AnalysisService:
             logger.error(f"Keyword extraction failed: {str(e)}")
             return []
     
-    def extract_topics(self, text: str, max_topics: int = 5) -> List[Dict[str, Any]]:
+    def extract_topics(self, text: str, max_topics: int = 5, shared: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """Extract topics using BERTopic"""
         try:
             bertopic = model_manager.get_bertopic_model()
             
             # Limit text for performance and split into sentences for better topic modeling
-            text_sample = text[:5000] if len(text) > 5000 else text
-            
-            # Split text into sentences to provide multiple samples
-            import re
-            sentences = re.split(r'[.!?]+', text_sample)
-            sentences = [s.strip() for s in sentences if len(s.strip()) > 20]  # Filter short sentences
+            if shared:
+                sentences, embeddings = shared['sentences'], shared['sentence_embeddings']
+            else:
+                sentences, embeddings = self._split_sentences(text[:ANALYSIS_SAMPLE_CHARS]), None
             
             # Need at least 2 samples for BERTopic
             if len(sentences) < 2:
                 return []
             
-            topics, _ = bertopic.fit_transform(sentences)
-            topic_info = bertopic.get_topic_info()
+            # Encode all sentences in one batched call rather than through BERTopic's own embedding step
+            if embeddings is None:
+                embeddings = self._encode(model_manager.get_sentence_encoder(), sentences)
+            
+            with self._bertopic_lock:
+                topics, _ = bertopic.fit_transform(sentences, embeddings=embeddings)
+                topic_info = bertopic.get_topic_info()
             
             topic_list = []
             for _, row in topic_info.head(max_topics).iterrows():
@@ -71,21 +162,64 @@ class AnalysisService:
     
     def analyze_sentiment(self, text: str) -> Dict[str, Any]:
         """Analyze sentiment"""
+        return self._sentiment_batch([text])[0]
+    
+    def _sentiment_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """Analyze sentiment for several texts in one model call"""
         try:
             sentiment_model = model_manager.get_sentiment_model()
             
             # Limit text length for model
-            text_sample = text[:512] if len(text) > 512 else text
-            
-            result = sentiment_model(text_sample)
+            texts = [_truncate_to_tokens(sentiment_model.tokenizer, text, SENTIMENT_MAX_TOKENS) for text in texts]
+            # Pipelines default to batch_size=1, which would still run one forward pass per text
+            results = sentiment_model(texts, batch_size=len(texts))
             
-            return {
-                'label': result[0]['label'],
-                'score': round(result[0]['score'], 3)
-            }
+            return [
+                {'label': result['label'], 'score': round(result['score'], 3)}
+                for result in results
+            ]
         except Exception as e:
             logger.error(f"Sentiment analysis failed: {str(e)}")
-            return {'label': 'NEUTRAL', 'score': 0.5}
+            return [{'label': 'NEUTRAL', 'score': 0.5} for _ in texts]
+    
+    async def analyze_sentiment_batched(self, text: str) -> Dict[str, Any]:
+        """Analyze sentiment through the micro-batcher shared by concurrent requests"""
+        if self._sentiment_worker_task is None or self._sentiment_worker_task.done():
+            self._sentiment_queue = asyncio.Queue()
+            self._sentiment_worker_task = asyncio.create_task(self._sentiment_worker())
+        
+        future = asyncio.get_running_loop().create_future()
+        self._sentiment_queue.put_nowait((text[:ANALYSIS_SAMPLE_CHARS], future))
+        return await future
+    
+    async def _sentiment_worker(self):
+        """Collect queued sentiment requests for up to SENTIMENT_BATCH_WINDOW and run them as one batch"""
+        loop = asyncio.get_running_loop()
+        while True:
+            items = [await self._sentiment_queue.get()]
+            deadline = loop.time() + SENTIMENT_BATCH_WINDOW
+            while len(items) < SENTIMENT_BATCH_SIZE:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    items.append(await asyncio.wait_for(self._sentiment_queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            
+            try:
+                results = await loop.run_in_executor(self._executor, self._sentiment_batch, [text for text, _ in items])
+            except Exception as e:
+                # Fail the waiting callers rather than leaving them suspended forever
+                for _, future in items:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            
+            for (_, future), result in zip(items, results):
+                # The caller may have been cancelled while the batch ran
+                if not future.done():
+                    future.set_result(result)
     
     def answer_question(self, question: str, context: str) -> Dict[str, Any]:
         """Answer question based on context using Q&A model"""
@@ -93,7 +227,7 @@ class AnalysisService:
             qa_model = model_manager.get_qa_model()
             
             # Limit context length
-            context_sample = context[:2000] if len(context) > 2000 else context
+            context_sample = _truncate_to_tokens(qa_model.tokenizer, context, QA_CONTEXT_MAX_TOKENS)
             
             result = qa_model(question=question, context=context_sample)
             
@@ -112,13 +246,34 @@ class AnalysisService:
                 'end': 0
             }
     
-    def full_analysis(self, text: str) -> Dict[str, Any]:
-        """Perform complete analysis (keywords, topics, sentiment)"""
-        return {
-            'keywords': self.extract_keywords(text),
-            'topics': self.extract_topics(text),
-            'sentiment': self.analyze_sentiment(text)
+    async def full_analysis(self, text: str) -> Dict[str, Any]:
+        """Perform complete analysis (keywords, topics, sentiment), running the independent stages concurrently"""
+        key = hashlib.blake2b(text[:ANALYSIS_SAMPLE_CHARS].encode('utf-8'), digest_size=16).hexdigest()
+        cached = self._cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < self._cache_ttl:
+            self._cache.move_to_end(key)
+            return cached[1]
+        
+        loop = asyncio.get_running_loop()
+        # Sentiment has its own model, so it starts right away while the shared embeddings are computed
+        sentiment_future = asyncio.ensure_future(self.analyze_sentiment_batched(text))
+        shared = await loop.run_in_executor(self._executor, self._shared_embeddings, text)
+        keywords, topics, sentiment = await asyncio.gather(
+            loop.run_in_executor(self._executor, self.extract_keywords, text, 10, shared),
+            loop.run_in_executor(self._executor, self.extract_topics, text, 5, shared),
+            sentiment_future
+        )
+        result = {
+            'keywords': keywords,
+            'topics': topics,
+            'sentiment': sentiment
         }
+        
+        self._cache[key] = (time.monotonic(), result)
+        self._cache.move_to_end(key)
+        while len(self._cache) > ANALYSIS_CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return result
 
 # Global instance
 analysis_service = AnalysisService()
@@ -3,14 +3,28 @@ Content Extraction & Preprocessing Service
 Handles web article URL content extraction and preprocessing
 """
 
+import asyncio
 import logging
 import requests
 from bs4 import BeautifulSoup
+import importlib.util
 import re
+import time
+from collections import OrderedDict
 from typing import Dict, Any
 
+from app.config.settings import get_settings
+
 logger = logging.getLogger(__name__)
 
+# lxml's C tree builder parses several times faster than the pure-Python html.parser
+HTML_PARSER = "lxml" if importlib.util.find_spec("lxml") else "html.parser"
+
+_BLANK_LINES = re.compile(r'\n\s*\n')
+_REPEATED_SPACES = re.compile(r' +')
+
+URL_CACHE_SIZE = 512
+
 class ContentExtractorService:
     """Extracts and preprocesses content from web URLs"""
     
@@ -18,39 +32,63 @@ class ContentExtractorService:
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
+        # Pooled connections reused across requests
+        self._session = requests.Session()
+        self._session.headers.update(self.headers)
+        # Recently extracted pages: url -> (fetched_at, result)
+        self._cache = OrderedDict()
+        self._cache_ttl = get_settings().CACHE_TTL
     
     async def extract_from_url(self, url: str) -> Dict[str, Any]:
         """Extract article content from URL"""
+        cached = self._cache.get(url)
+        if cached is not None and time.monotonic() - cached[0] < self._cache_ttl:
+            self._cache.move_to_end(url)
+            return cached[1]
+        
         try:
-            response = requests.get(url, headers=self.headers, timeout=30)
+            # requests blocks, so the fetch and the parse both run in worker threads
+            response = await asyncio.to_thread(self._session.get, url, timeout=30)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Remove unwanted elements
-            for element in soup(['script', 'style', 'nav', 'footer', 'header', 'aside']):
-                element.decompose()
-            
-            # Extract title
-            title = soup.find('title')
-            title_text = title.get_text().strip() if title else "Untitled"
-            
-            # Extract main content
-            content_text = self._extract_main_content(soup)
-            
-            # Clean text
-            content_text = self._clean_text(content_text)
-            
-            return {
-                'title': title_text,
-                'content': content_text,
-                'url': url,
-                'word_count': len(content_text.split()),
-                'char_count': len(content_text)
-            }
+            result = await asyncio.to_thread(self._parse_article, response.content, url)
         except Exception as e:
             logger.error(f"Error extracting URL content: {str(e)}")
             raise
+        
+        # Empty extractions are often transient (JS-rendered pages, interstitials), so they are retried next time
+        if result['content'].strip():
+            self._cache[url] = (time.monotonic(), result)
+            self._cache.move_to_end(url)
+            while len(self._cache) > URL_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return result
+    
+    def _parse_article(self, html: bytes, url: str) -> Dict[str, Any]:
+        """Parse title and main text out of an HTML page"""
+        soup = BeautifulSoup(html, HTML_PARSER)
+        
+        # Remove unwanted elements
+        for element in soup(['script', 'style', 'nav', 'footer', 'header', 'aside']):
+            element.decompose()
+        
+        # Extract title
+        title = soup.find('title')
+        title_text = title.get_text().strip() if title else "Untitled"
+        
+        # Extract main content
+        content_text = self._extract_main_content(soup)
+        
+        # Clean text
+        content_text = self._clean_text(content_text)
+        
+        return {
+            'title': title_text,
+            'content': content_text,
+            'url': url,
+            'word_count': len(content_text.split()),
+            'char_count': len(content_text)
+        }
     
     def _extract_main_content(self, soup: BeautifulSoup) -> str:
         """Extract main article content using multiple strategies"""
@@ -78,9 +116,9 @@ class ContentExtractorService:
     def _clean_text(self, text: str) -> str:
         """Clean extracted text"""
         # Remove multiple newlines
-        text = re.sub(r'\n\s*\n', '\n\n', text)
+        text = _BLANK_LINES.sub('\n\n', text)
         # Remove multiple spaces
-        text = re.sub(r' +', ' ', text)
+        text = _REPEATED_SPACES.sub(' ', text)
         # Remove leading/trailing whitespace
         return text.strip()
 
@@ -15,6 +15,8 @@ from keybert import KeyBERT
 from bertopic import BERTopic
 import os
 import gc
+import threading
+from contextlib import contextmanager
 import psutil
 from typing import Dict, Any, Optional
 from functools import lru_cache
@@ -43,12 +45,16 @@ class OptimizedModelManager:
         self.device = self._get_optimal_device()
         self.torch_dtype = torch.float16 if self.device == "cuda" else torch.float32
         self.max_models_in_memory = int(os.getenv("MAX_MODELS_IN_MEMORY", "3"))
+        self.use_quantization = os.getenv("USE_QUANTIZATION", "true").lower() == "true"
         self.model_load_order = []
+        self._active_inferences = 0
+        self._inference_lock = threading.Lock()
         
         logger.info(f"OptimizedModelManager initialized")
         logger.info(f"Device: {self.device}")
         logger.info(f"Torch dtype: {self.torch_dtype}")
         logger.info(f"Max models in memory: {self.max_models_in_memory}")
+        logger.info(f"Quantization: {self.use_quantization}")
         self._log_system_info()
     
     def _get_optimal_device(self) -> str:
@@ -131,6 +137,20 @@ class OptimizedModelManager:
             
             raise Exception(f"Failed to load both primary and fallback models for {task}")
     
+    def _quantize_pipeline(self, model_pipeline):
+        """Apply dynamic int8 quantization to a pipeline's Linear layers on CPU"""
+        # GPU already runs in float16; dynamic int8 kernels are CPU-only
+        if self.device != "cpu" or not self.use_quantization:
+            return model_pipeline
+        try:
+            model_pipeline.model = torch.ao.quantization.quantize_dynamic(
+                model_pipeline.model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+            logger.info(f"Quantized {model_pipeline.model.config.name_or_path} to int8")
+        except Exception as e:
+            logger.warning(f"Quantization failed, keeping float32 weights: {str(e)}")
+        return model_pipeline
+    
     # ============ SUMMARIZATION MODELS ============
     
     def get_text_summarizer(self):
@@ -222,12 +242,18 @@ class OptimizedModelManager:
     
     # ============ ANALYSIS MODELS ============
     
+    @lru_cache(maxsize=1)
+    def get_sentence_encoder(self):
+        """Sentence embedding model shared by KeyBERT and BERTopic"""
+        logger.info("Loading sentence encoder...")
+        return SentenceTransformer('all-MiniLM-L6-v2', device=self.device)
+    
     @lru_cache(maxsize=1)
     def get_keybert_model(self):
         """KeyBERT for keyword extraction"""
         try:
             logger.info("Loading KeyBERT model...")
-            model = KeyBERT(model='all-MiniLM-L6-v2')
+            model = KeyBERT(model=self.get_sentence_encoder())
             logger.info("Successfully loaded KeyBERT")
             return model
         except Exception as e:
@@ -241,7 +267,7 @@ class OptimizedModelManager:
         try:
             logger.info("Loading BERTopic model...")
             model = BERTopic(
-                embedding_model='all-MiniLM-L6-v2',
+                embedding_model=self.get_sentence_encoder(),
                 calculate_probabilities=True,
                 verbose=False
             )
@@ -270,11 +296,12 @@ class OptimizedModelManager:
         model_name = "deepset/roberta-base-squad2"
         if model_name not in self.models:
             self._manage_memory(model_name)
-            self.models[model_name] = self._load_model_with_fallback(
+            qa_pipeline = self._load_model_with_fallback(
                 model_name,
                 "question-answering",
                 fallback_model="distilbert-base-cased-distilled-squad"
             )
+            self.models[model_name] = self._quantize_pipeline(qa_pipeline)
         return self.models[model_name]
     
     def get_multilingual_qa_model(self):
@@ -282,11 +309,12 @@ class OptimizedModelManager:
         model_name = "deepset/xlm-roberta-base-squad2"
         if model_name not in self.models:
             self._manage_memory(model_name)
-            self.models[model_name] = self._load_model_with_fallback(
+            qa_pipeline = self._load_model_with_fallback(
                 model_name,
                 "question-answering",
                 fallback_model="deepset/roberta-base-squad2"
             )
+            self.models[model_name] = self._quantize_pipeline(qa_pipeline)
         return self.models[model_name]
     
     # ============ UTILITY METHODS ============
@@ -309,9 +337,28 @@ class OptimizedModelManager:
         self.model_load_order.clear()
         gc.collect()
         if self.device == "cuda":
+            # Let in-flight kernels finish so their blocks are actually returnable; memory still
+            # referenced by running requests stays allocated regardless
+            torch.cuda.synchronize()
             torch.cuda.empty_cache()
         logger.info("Model cache cleared")
     
+    @contextmanager
+    def in_inference(self):
+        """Mark a model forward pass as running so monitoring can avoid the CUDA allocator"""
+        with self._inference_lock:
+            self._active_inferences += 1
+        try:
+            yield
+        finally:
+            with self._inference_lock:
+                self._active_inferences -= 1
+    
+    @property
+    def inference_active(self) -> bool:
+        """Whether any model forward pass is currently running"""
+        return self._active_inferences > 0
+    
     def get_memory_usage(self) -> Dict[str, float]:
         """Get current memory usage"""
         memory = psutil.virtual_memory()
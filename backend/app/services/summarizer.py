@@ -7,6 +7,7 @@ import logging
 import warnings
 from typing import Optional, List
 from .models import model_manager
+from .summary_cache import cached_summary
 
 warnings.filterwarnings("ignore")
 
@@ -87,6 +88,11 @@ class SummarizationService:
 
     # === Core Summarization ===
     def _summarize_chunk(self, model, text: str, max_tokens: int, min_tokens: int) -> str:
+        # Flag generation as active so health probes serve cached GPU stats meanwhile
+        with model_manager.in_inference():
+            return self._generate_chunk_summary(model, text, max_tokens, min_tokens)
+    
+    def _generate_chunk_summary(self, model, text: str, max_tokens: int, min_tokens: int) -> str:
         result = model(
             text,
             max_length=max_tokens,
@@ -149,6 +155,7 @@ class SummarizationService:
         return chunks or [text]
 
     # === Public Entry Points ===
+    @cached_summary
     def summarize_text(
         self,
         text: str,
@@ -174,6 +181,7 @@ class SummarizationService:
         combined = " ".join(summaries)
         return self._summarize_chunk(model, combined, max_tok, min_tok)
 
+    @cached_summary
     def summarize_document(self, text: str, summary_style: str = "detailed") -> str:
         model = model_manager.get_document_summarizer()
         max_w, min_w = self.calculate_adaptive_length(text)
@@ -185,6 +193,7 @@ class SummarizationService:
         combined = " ".join(summaries)
         return self._summarize_chunk(model, combined, max_tok, min_tok)
 
+    @cached_summary
     def summarize_url(self, text: str, summary_style: str = "detailed") -> str:
         model = model_manager.get_url_summarizer()
         max_w, min_w = self.calculate_adaptive_length(text)
@@ -198,6 +207,7 @@ class SummarizationService:
         combined = " ".join(summaries)
         return self._summarize_chunk(model, combined, max_tok, min_tok)
 
+    @cached_summary
     def summarize_youtube(self, text: str, summary_style: str = "detailed") -> str:
         model = model_manager.get_long_summarizer()
         max_w, min_w = self.calculate_adaptive_length(text)
@@ -211,6 +221,7 @@ class SummarizationService:
         combined = " ".join(summaries)
         return self._summarize_chunk(model, combined, max_tok, min_tok)
 
+    @cached_summary
     def summarize_multilingual(self, text: str, summary_style: str = "detailed") -> str:
         model = model_manager.get_multilingual_summarizer()
         max_w, min_w = self.calculate_adaptive_length(text)
@@ -225,16 +236,21 @@ class SummarizationService:
         return self._summarize_chunk(model, combined, max_tok, min_tok)
 
     # === Utility Methods for Routes ===
-    def calculate_compression_ratio(self, original: str, summary: str) -> float:
-        orig_words = len(original.split())
-        summ_words = len(summary.split())
+    # Callers that already counted words pass the counts in to skip re-splitting the text
+    def calculate_compression_ratio(self, original: str, summary: str,
+                                    orig_words: Optional[int] = None, summ_words: Optional[int] = None) -> float:
+        if orig_words is None:
+            orig_words = len(original.split())
+        if summ_words is None:
+            summ_words = len(summary.split())
         if orig_words == 0:
             return 0.0
         ratio = (orig_words - summ_words) / orig_words * 100
         return round(ratio, 2)
 
-    def calculate_reading_time(self, text: str, wpm: int = 200) -> int:
-        word_count = len(text.split())
+    def calculate_reading_time(self, text: str, wpm: int = 200, word_count: Optional[int] = None) -> int:
+        if word_count is None:
+            word_count = len(text.split())
         return max(1, round(word_count / wpm))
 
 
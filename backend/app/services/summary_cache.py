@@ -0,0 +1,122 @@
+"""
+Summary Cache
+Content-addressed store for generated summaries, persisted in SQLite
+"""
+
+import hashlib
+import inspect
+import logging
+import sqlite3
+import threading
+import time
+from functools import wraps
+from pathlib import Path
+from typing import Optional
+
+from app.config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+MAX_CACHED_SUMMARIES = 5000
+
+
+class SummaryCache:
+    """Summaries keyed on sha256(params|text), expired after ttl seconds and evicted least recently used"""
+
+    def __init__(self, path: Path, ttl: int, max_entries: int = MAX_CACHED_SUMMARIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Autocommit mode; every statement below is a single self-contained write
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS summaries ("
+            "key TEXT PRIMARY KEY, summary TEXT NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS summaries_accessed ON summaries (accessed)")
+
+    @staticmethod
+    def make_key(text: str, **params) -> str:
+        params_repr = ",".join(f"{name}={value!r}" for name, value in sorted(params.items()))
+        return hashlib.sha256(f"{params_repr}|{text}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT summary, created FROM summaries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if now - row[1] >= self.ttl:
+                self._conn.execute("DELETE FROM summaries WHERE key = ?", (key,))
+                return None
+            self._conn.execute("UPDATE summaries SET accessed = ? WHERE key = ?", (now, key))
+        return row[0]
+
+    def set(self, key: str, summary: str):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO summaries (key, summary, created, accessed) VALUES (?, ?, ?, ?)",
+                (key, summary, now, now)
+            )
+            self._conn.execute(
+                "DELETE FROM summaries WHERE key IN "
+                "(SELECT key FROM summaries ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+
+
+def _create_summary_cache() -> Optional[SummaryCache]:
+    settings = get_settings()
+    if not settings.ENABLE_RESULT_CACHING:
+        return None
+    # MODEL_CACHE_DIR is always set (empty values fall back to the default), so this never lands in the working directory
+    path = Path(settings.MODEL_CACHE_DIR).expanduser() / "summaries.db"
+    try:
+        cache = SummaryCache(path, ttl=settings.CACHE_TTL)
+        logger.info(f"Summary cache at {path}")
+        return cache
+    except sqlite3.Error as e:
+        logger.warning(f"Summary cache unavailable: {str(e)}")
+        return None
+
+
+summary_cache = _create_summary_cache()
+
+
+def cached_summary(method):
+    """Serve repeated (text, parameters) calls of a summarizer method from the summary cache"""
+    signature = inspect.signature(method)
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if summary_cache is None:
+            return method(self, *args, **kwargs)
+
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        params = {name: value for name, value in bound.arguments.items() if name not in ("self", "text")}
+        key = SummaryCache.make_key(bound.arguments["text"], method=method.__name__, **params)
+
+        # A cache failure should never cost the summary itself
+        try:
+            cached = summary_cache.get(key)
+        except sqlite3.Error as e:
+            logger.warning(f"Summary cache read failed: {str(e)}")
+            cached = None
+        if cached is not None:
+            return cached
+
+        summary = method(self, *args, **kwargs)
+        try:
+            summary_cache.set(key, summary)
+        except sqlite3.Error as e:
+            logger.warning(f"Summary cache write failed: {str(e)}")
+        return summary
+
+    return wrapper
@@ -185,10 +185,12 @@ export const exportAPI = {
     return response.data
   },
   
-  // Batch export
+  // Batch export (ZIP archive)
   batchExport: async (data) => {
-    const response = await apiClient.post('/export/batch', data)
-    return response.data
+    const response = await apiClient.post('/export/batch', data, {
+      responseType: 'blob',
+    })
+    return response
   },
 }
 